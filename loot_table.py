@@ -1,20 +1,116 @@
 import random
 import json
+import atexit
 import os
 import signal
 import sys
-import copy
+import io
+import traceback
+from bisect import bisect
+from collections import Counter
+from contextlib import contextmanager
+from itertools import accumulate
+
+try:
+    import orjson  # Optional: much faster save/load for large game states
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # Optional: used instead of the stdlib json when orjson is missing
+except ImportError:
+    ujson = None
+
+try:
+    import zstandard as zstd  # Optional: enables compressed saves when save_file ends in .zst
+except ImportError:
+    zstd = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"  # Leading bytes of every zstd frame
+
+if orjson is not None:
+    def dump_json(data, pretty=False):
+        # OPT_NON_STR_KEYS stringifies non-str dict keys the way json.dumps does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    load_json = orjson.loads
+elif ujson is not None:
+    def dump_json(data, pretty=False):
+        # ujson is compact by default and stringifies non-str keys like json.dumps
+        return ujson.dumps(data, indent=2 if pretty else 0, ensure_ascii=False).encode("utf-8")
+    load_json = ujson.loads
+else:
+    def dump_json(data, pretty=False):
+        if pretty:
+            return json.dumps(data, indent=2).encode("utf-8")
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    load_json = json.loads
+
+SEP = "=" * 60  # Separator line used by full-width screens
+SAVE_FORMAT_VERSION = 3  # Saves at this version use the current item/enchantment layout throughout
+
+# Private generator for weighted rolls; _random is bound once for the single-roll hot paths
+_rng = random.Random()
+_random = _rng.random
+
+_piped_lines = None  # Iterator over stdin lines once read_input sees it is piped; False for a terminal
 
 
 class MasterItem:
     """Defines a master item template with name, type, and base gold value."""
+    __slots__ = ("name", "item_type", "item_type_lower", "gold_value_per_unit", "purchase_price", "_recipe",
+                 "required_counts")
+
     def __init__(self, name, item_type, gold_value_per_unit, purchase_price=None, recipe=None):
         self.name = name
-        self.item_type = item_type
+        self.set_item_type(item_type)
         self.gold_value_per_unit = gold_value_per_unit
         self.purchase_price = purchase_price  # Price to buy from shop (None = not for sale)
         self.recipe = recipe if recipe is not None else []  # List of ingredient names (empty = not craftable)
 
+    def set_item_type(self, item_type):
+        """Set item_type along with the lowercased copy used for type checks."""
+        self.item_type = sys.intern(item_type)
+        self.item_type_lower = sys.intern(item_type.lower())
+
+    def format_recipe(self):
+        """Recipe as display text, e.g. "2x Iron, Wood"."""
+        return ", ".join(f"{count}x {name}" if count > 1 else name for name, count in self.required_counts.items())
+
+    @property
+    def recipe(self):
+        return self._recipe
+
+    @recipe.setter
+    def recipe(self, ingredients):
+        self._recipe = list(ingredients)
+        self.required_counts = Counter(self._recipe)  # Ingredient name -> required quantity
+
+    def add_ingredient(self, name, quantity=1):
+        """Add an ingredient to the recipe, keeping required_counts in sync."""
+        self._recipe.extend([name] * quantity)
+        self.required_counts[name] += quantity
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'item_type': self.item_type,
+            'gold_value_per_unit': self.gold_value_per_unit,
+            'purchase_price': self.purchase_price,
+            'recipe': self._recipe
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(
+            data['name'],
+            data['item_type'],
+            data['gold_value_per_unit'],
+            get('purchase_price'),  # Backward compatible
+            get('recipe', [])  # Backward compatible
+        )
+
     def create_loot_item(self, quantity=1, weight=1000):
         """Create a LootItem instance from this master item."""
         total_value = self.gold_value_per_unit * quantity
@@ -29,17 +125,86 @@ class MasterItem:
         return self.__str__()
 
 
+def _enchantment_row(ench, ench_rows):
+    """Serialized form of ench, built once per save since items share Enchantment objects."""
+    row = ench_rows.get(id(ench))
+    if row is None:
+        row = ench_rows[id(ench)] = ench.to_dict()
+    return row
+
+
 class LootItem:
+    __slots__ = ("name", "weight", "gold_value", "item_type", "item_type_lower", "quantity", "rarity",
+                 "enchantments", "_display_cache", "_effects_cache")
+
+    # Bumped when shared Enchantment definitions are edited, so cached display strings go stale
+    _display_generation = 0
+
     def __init__(self, name, weight, gold_value, item_type="misc", quantity=1, rarity=None):
         self.name = name
         self.weight = weight
         self.gold_value = gold_value
-        self.item_type = item_type
+        self.set_item_type(item_type)
         self.quantity = quantity
-        self.rarity = rarity  # For Equipment items: Normal, Rare, Epic, Legendary
+        self.rarity = sys.intern(rarity) if rarity else rarity  # For Equipment items: Normal, Rare, Epic, Legendary
         self.enchantments = []  # List of (enchantment, rolled_value) tuples
         # For monetary: rolled_value is the actual rolled gold modifier
         # For functional: rolled_value is None
+        self._display_cache = None  # (state key, string) from the last get_display_name call
+        self._effects_cache = None  # (state key, string) from the last get_effects_display call
+
+    def set_item_type(self, item_type):
+        """Set item_type along with the lowercased copy used for type checks."""
+        # Small fixed vocabulary; interned to share one copy per value
+        self.item_type = sys.intern(item_type)
+        self.item_type_lower = sys.intern(item_type.lower())
+
+    @classmethod
+    def invalidate_display_caches(cls):
+        """Force every item to rebuild its display strings on next use."""
+        cls._display_generation += 1
+
+    def clone(self):
+        """Create an independent copy of this item.
+
+        Enchantment definitions are shared; the (enchantment, rolled_value) list is copied.
+        """
+        # Fields are already normalized, so skip __init__ and copy slots directly
+        item = LootItem.__new__(LootItem)
+        item.name = self.name
+        item.weight = self.weight
+        item.gold_value = self.gold_value
+        item.item_type = self.item_type
+        item.item_type_lower = self.item_type_lower
+        item.quantity = self.quantity
+        item.rarity = self.rarity
+        item.enchantments = list(self.enchantments)
+        item._display_cache = self._display_cache
+        item._effects_cache = self._effects_cache
+        return item
+
+    def to_dict(self, ench_rows=None):
+        """ench_rows: optional {id(enchantment): dict} memo shared across one save."""
+        if ench_rows is None:
+            ench_rows = {}
+        return {
+            'name': self.name,
+            'weight': self.weight,
+            'gold_value': self.gold_value,
+            'item_type': self.item_type,
+            'quantity': self.quantity,
+            'rarity': self.rarity,
+            'enchantments': [dict(_enchantment_row(ench, ench_rows), rolled_value=rolled_value)
+                             for ench, rolled_value in self.enchantments]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Load an item saved at SAVE_FORMAT_VERSION, where every field is present."""
+        item = cls(data['name'], data['weight'], data['gold_value'], data['item_type'], data['quantity'], data['rarity'])
+        for ench_data in data['enchantments']:
+            item.enchantments.append((Enchantment.from_dict(ench_data), ench_data['rolled_value']))
+        return item
 
     def add_enchantment(self, enchantment, rolled_value=None):
         """Add an enchantment to this item.
@@ -52,17 +217,21 @@ class LootItem:
                 rolled_value = enchantment.apply_to_item(self)
             else:
                 # Apply the provided rolled value
-                if enchantment.is_percentage:
-                    change = self.gold_value * (rolled_value / 100.0)
-                    self.gold_value = max(0, int(self.gold_value + change))
-                else:
-                    self.gold_value = max(0, int(self.gold_value + rolled_value))
+                self.gold_value = enchantment.modify_value(self.gold_value, rolled_value)
         # For functional enchantments, rolled_value stays None
 
         # Store enchantment with its rolled value (or None for functional) as a tuple
         self.enchantments.append((enchantment, rolled_value))
 
     def get_display_name(self):
+        # Enchantments are only ever appended, so their count stands in for the list contents
+        key = (LootItem._display_generation, self.name, self.quantity, self.rarity, len(self.enchantments))
+        cached = self._display_cache
+        if cached is None or cached[0] != key:
+            cached = self._display_cache = (key, self._build_display_name())
+        return cached[1]
+
+    def _build_display_name(self):
         base_name = f"{self.quantity}x {self.name}" if self.quantity > 1 else self.name
 
         # Add rarity prefix for Equipment items
@@ -84,6 +253,13 @@ class LootItem:
 
     def get_effects_display(self):
         """Get display string for functional enchantments."""
+        key = (LootItem._display_generation, len(self.enchantments))
+        cached = self._effects_cache
+        if cached is None or cached[0] != key:
+            cached = self._effects_cache = (key, self._build_effects_display())
+        return cached[1]
+
+    def _build_effects_display(self):
         functional_enchants = [(ench, rv) for ench, rv in self.enchantments if ench.enchantment_type == "functional"]
         if not functional_enchants:
             return ""
@@ -102,12 +278,23 @@ class LootItem:
         return self.__str__()
 
 
+def _flat_change(gold_value, rolled_value):
+    return max(0, int(gold_value + rolled_value))
+
+
+def _percent_change(gold_value, rolled_value):
+    return max(0, int(gold_value + gold_value * (rolled_value / 100.0)))
+
+
 class Enchantment:
     """Unified enchantment system supporting both functional and monetary types.
 
     Monetary enchantments: Modify gold value, applicable to any item type
     Functional enchantments: Provide gameplay effects, only for equipment/upgrades
     """
+    __slots__ = ("name", "enchantment_type", "enchant_type", "min_value", "max_value", "is_percentage",
+                 "cost_amount", "effect_type", "value", "weight", "modify_value")
+
     def __init__(self, name, enchantment_type, **kwargs):
         """
         Args:
@@ -128,22 +315,22 @@ class Enchantment:
                 weight: Weight for random selection when crafting
         """
         self.name = name
-        self.enchantment_type = enchantment_type
+        self.enchantment_type = sys.intern(enchantment_type)
 
         if enchantment_type == "monetary":
-            self.enchant_type = kwargs.get('enchant_type', 'misc')
+            self.enchant_type = sys.intern(kwargs.get('enchant_type', 'misc'))
             self.min_value = kwargs.get('min_value', 0)
             self.max_value = kwargs.get('max_value', 0)
-            self.is_percentage = kwargs.get('is_percentage', False)
+            self.is_percentage = bool(kwargs.get('is_percentage', False))
             self.cost_amount = kwargs.get('cost_amount', 1)
             # Functional fields not used
             self.effect_type = None
             self.value = None
             self.weight = None
         elif enchantment_type == "functional":
-            self.effect_type = kwargs.get('effect_type', 'draw_cost_reduction')
+            self.effect_type = sys.intern(kwargs.get('effect_type', 'draw_cost_reduction'))
             self.value = kwargs.get('value', 0)
-            self.is_percentage = kwargs.get('is_percentage', False)
+            self.is_percentage = bool(kwargs.get('is_percentage', False))
             self.weight = kwargs.get('weight', 1000)
             # Monetary fields not used
             self.enchant_type = None
@@ -153,11 +340,68 @@ class Enchantment:
         else:
             raise ValueError(f"Invalid enchantment_type: {enchantment_type}. Must be 'monetary' or 'functional'")
 
+        # modify_value(gold_value, rolled_value) -> new gold value, floored at 0.
+        # Picked once here so applying a roll doesn't re-check is_percentage.
+        self.modify_value = _percent_change if self.is_percentage else _flat_change
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'enchantment_type': self.enchantment_type,
+            'enchant_type': self.enchant_type,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'effect_type': self.effect_type,
+            'value': self.value,
+            'weight': self.weight,
+            'is_percentage': self.is_percentage,
+            'cost_amount': self.cost_amount
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Load an enchantment saved at SAVE_FORMAT_VERSION, where every field is present."""
+        if data['enchantment_type'] == "monetary":
+            return cls._make_monetary(data['name'], data['enchant_type'], data['min_value'],
+                                      data['max_value'], data['is_percentage'], data['cost_amount'])
+        return cls._make_functional(data['name'], data['effect_type'], data['value'],
+                                    data['is_percentage'], data['weight'])
+
+    @classmethod
+    def _make_monetary(cls, name, enchant_type, min_value, max_value, is_percentage, cost_amount):
+        """Build a monetary enchantment from current-format save data without kwargs parsing."""
+        ench = cls.__new__(cls)
+        ench.name = name
+        ench.enchantment_type = "monetary"
+        ench.enchant_type = sys.intern(enchant_type)
+        ench.min_value = min_value
+        ench.max_value = max_value
+        ench.is_percentage = bool(is_percentage)
+        ench.cost_amount = cost_amount
+        ench.effect_type = ench.value = ench.weight = None
+        ench.modify_value = _percent_change if ench.is_percentage else _flat_change
+        return ench
+
+    @classmethod
+    def _make_functional(cls, name, effect_type, value, is_percentage, weight):
+        """Build a functional enchantment from current-format save data without kwargs parsing."""
+        ench = cls.__new__(cls)
+        ench.name = name
+        ench.enchantment_type = "functional"
+        ench.effect_type = sys.intern(effect_type)
+        ench.value = value
+        ench.is_percentage = bool(is_percentage)
+        ench.weight = weight
+        ench.enchant_type = ench.min_value = ench.max_value = ench.cost_amount = None
+        ench.modify_value = _percent_change if ench.is_percentage else _flat_change
+        return ench
+
     def roll_value(self):
         """Roll a random value within the enchantment's range (monetary only)."""
         if self.enchantment_type != "monetary":
             raise ValueError("Cannot roll value for non-monetary enchantments")
-        return random.uniform(self.min_value, self.max_value)
+        # Same formula as random.uniform, drawn from the module's bound generator
+        return self.min_value + (self.max_value - self.min_value) * _random()
 
     def apply_to_item(self, item):
         """Apply this enchantment to an item and return the rolled value (monetary only)."""
@@ -165,15 +409,7 @@ class Enchantment:
             raise ValueError("Cannot apply functional enchantment to item gold value")
 
         rolled_value = self.roll_value()
-
-        if self.is_percentage:
-            # Apply percentage change to gold value
-            change = item.gold_value * (rolled_value / 100.0)
-            item.gold_value = max(0, int(item.gold_value + change))
-        else:
-            # Apply flat change to gold value
-            item.gold_value = max(0, int(item.gold_value + rolled_value))
-
+        item.gold_value = self.modify_value(item.gold_value, rolled_value)
         return rolled_value
 
     def get_effect_string(self):
@@ -210,12 +446,31 @@ class RaritySystem:
             "Epic": {"weight": 150, "max_effects": 3},
             "Legendary": {"weight": 50, "max_effects": 5}
         }
+        self._rebuild_weights()
+
+    def _rebuild_weights(self):
+        """Refresh the cached name and cumulative weight lists used by roll_rarity."""
+        self._names = list(self.rarities)
+        self._weights = [self.rarities[r]["weight"] for r in self._names]
+        self._cum_weights = list(accumulate(self._weights))
+        self._total_weight = self._cum_weights[-1] if self._cum_weights else 0
+        self._weight_map = dict(zip(self._names, self._weights))
 
     def roll_rarity(self):
         """Roll a random rarity based on weights."""
-        rarity_names = list(self.rarities.keys())
-        weights = [self.rarities[r]["weight"] for r in rarity_names]
-        return random.choices(rarity_names, weights=weights, k=1)[0]
+        return self._names[bisect(self._cum_weights, _random() * self._total_weight)]
+
+    def roll_rarities(self, count):
+        """Roll count rarities at once; same odds as calling roll_rarity count times."""
+        return _rng.choices(self._names, cum_weights=self._cum_weights, k=count)
+
+    def get_total_weight(self):
+        """Get the sum of all rarity weights."""
+        return self._total_weight
+
+    def get_weights(self):
+        """Get {rarity: weight}. The dict is shared and rebuilt by set_weight; don't modify it."""
+        return self._weight_map
 
     def get_max_effects(self, rarity):
         """Get the maximum number of effects for a given rarity."""
@@ -225,20 +480,43 @@ class RaritySystem:
         """Set the weight for a specific rarity."""
         if rarity in self.rarities:
             self.rarities[rarity]["weight"] = weight
+            self._rebuild_weights()
             return True
         return False
 
 
 class Consumable:
     """Consumable item with temporary effects."""
+    __slots__ = ("name", "item_type", "effect_type", "effect_value", "gold_value", "table_name")
+
     def __init__(self, name, effect_type, effect_value=None, gold_value=0, table_name=None):
         self.name = name
         self.item_type = "consumable"
-        self.effect_type = effect_type  # e.g., "double_next_draw"
+        self.effect_type = sys.intern(effect_type)  # e.g., "double_next_draw"
         self.effect_value = effect_value  # Optional value for the effect
         self.gold_value = gold_value  # Base sell value
         self.table_name = table_name  # For free_draw_ticket: which table to draw from
 
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'effect_type': self.effect_type,
+            'effect_value': self.effect_value,
+            'gold_value': self.gold_value,
+            'table_name': self.table_name
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(
+            data['name'],
+            data['effect_type'],
+            get('effect_value'),
+            get('gold_value', 0),
+            get('table_name')  # Backward compatibility: None if not present
+        )
+
     def __str__(self):
         if self.effect_type == "double_next_draw":
             return f"{self.name} (consumable, {self.gold_value}g) - Doubles quantity on next draw"
@@ -254,122 +532,210 @@ class Consumable:
         return self.__str__()
 
 
+def _serialize_items(items, ench_rows=None):
+    return [item.to_dict(ench_rows) for item in items]
+
+
 class Player:
+    __slots__ = ("name", "gold", "inventory", "_qty_by_name", "_items_by_name", "_stack_index",
+                 "_consumable_cache", "equipped_items", "consumed_upgrades", "_effect_cache",
+                 "active_consumable_effects")
+
     def __init__(self, name):
         self.name = name
         self.gold = 0
         self.inventory = []
+        self._qty_by_name = {}  # Item name -> total quantity held in inventory
+        self._items_by_name = {}  # Item name -> stacks with that name, in inventory order
+        self._stack_index = {}  # (name, item_type) -> the plain stack new copies merge into
+        self._consumable_cache = None  # (inventory index, item) for each consumable stack, reset when stacks move
         self.equipped_items = []  # Items currently equipped
         self.consumed_upgrades = []  # Upgrades that have been consumed
+        self._effect_cache = None  # Totals from _recompute_effects, reset when gear changes
         self.active_consumable_effects = []  # Active temporary effects from consumables
 
+    def to_dict(self, ench_rows=None):
+        return {
+            'gold': self.gold,
+            'inventory': _serialize_items(self.inventory, ench_rows),
+            'equipped_items': _serialize_items(self.equipped_items, ench_rows),
+            'consumed_upgrades': _serialize_items(self.consumed_upgrades, ench_rows),
+            'active_consumable_effects': self.active_consumable_effects
+        }
+
+    @classmethod
+    def from_dict(cls, name, data, load_item):
+        """Rebuild a player; load_item turns one saved item dict into a LootItem."""
+        player = cls(name)
+        player.gold = data['gold']
+        # Saved state was valid when written, so adopt the lists rather than re-adding item by item
+        player._restore_inventory([load_item(item_data) for item_data in data.get('inventory', [])])
+        player.equipped_items = [load_item(item_data) for item_data in data.get('equipped_items', [])]
+        player.consumed_upgrades = [load_item(item_data) for item_data in data.get('consumed_upgrades', [])]
+        effects = data.get('active_consumable_effects', [])
+        for effect in effects:
+            effect['effect_type'] = sys.intern(effect['effect_type'])  # Matched against literals on every draw
+        player.active_consumable_effects = effects
+        return player
+
+    def _restore_inventory(self, items):
+        """Adopt an already-stacked inventory, rebuilding the lookup indexes in one pass."""
+        self.inventory = items
+        self._consumable_cache = None
+        qty_by_name = self._qty_by_name
+        for item in items:
+            qty_by_name[item.name] = qty_by_name.get(item.name, 0) + item.quantity
+            self._items_by_name.setdefault(item.name, []).append(item)
+            if not item.enchantments and not item.rarity:
+                self._stack_index.setdefault((item.name, item.item_type), item)
+
     def add_item(self, item):
         """Add item to inventory with automatic stacking."""
+        self._qty_by_name[item.name] = self._qty_by_name.get(item.name, 0) + item.quantity
+
         # Items with enchantments (monetary or functional) or rarity don't stack (they're unique)
         if item.enchantments or item.rarity:
-            self.inventory.append(item)
+            self._append_stack(item)
             return
 
-        # Try to find existing stack with same name and type
-        for existing_item in self.inventory:
-            if (existing_item.name == item.name and
-                existing_item.item_type == item.item_type and
-                not existing_item.enchantments and
-                not existing_item.rarity):
-                # Stack found - combine quantities and values
-                existing_item.quantity += item.quantity
-                existing_item.gold_value += item.gold_value
-                return
+        # Only plain stacks are indexed, so a hit can always take the merge
+        key = (item.name, item.item_type)
+        existing_item = self._stack_index.get(key)
+        if existing_item is not None:
+            # Stack found - combine quantities and values
+            existing_item.quantity += item.quantity
+            existing_item.gold_value += item.gold_value
+            return
 
         # No stack found - add as new item
+        self._stack_index[key] = item
+        self._append_stack(item)
+
+    def _append_stack(self, item):
         self.inventory.append(item)
+        self._consumable_cache = None
+        self._items_by_name.setdefault(item.name, []).append(item)
+
+    def unindex_stack(self, item):
+        """Stop merging new copies into item. Call after enchanting an inventory stack in place."""
+        key = (item.name, item.item_type)
+        if self._stack_index.get(key) is item:
+            del self._stack_index[key]
 
     def remove_item(self, index):
         if 0 <= index < len(self.inventory):
-            return self.inventory.pop(index)
+            item = self.inventory.pop(index)
+            self._consumable_cache = None
+            self._adjust_item_count(item.name, -item.quantity)
+            self.unindex_stack(item)
+            stacks = self._items_by_name[item.name]
+            if len(stacks) == 1:
+                del self._items_by_name[item.name]
+            else:
+                stacks.remove(item)  # LootItem has no __eq__, so this matches by identity
+            return item
         return None
 
+    def _adjust_item_count(self, item_name, delta):
+        remaining = self._qty_by_name.get(item_name, 0) + delta
+        if remaining > 0:
+            self._qty_by_name[item_name] = remaining
+        else:
+            self._qty_by_name.pop(item_name, None)
+
+    def get_consumable_items(self):
+        """Get (inventory index, item) for every consumable stack in inventory order (cached)."""
+        if self._consumable_cache is None:
+            self._consumable_cache = [(i, item) for i, item in enumerate(self.inventory)
+                                      if item.item_type == "consumable"]
+        return self._consumable_cache
+
+    def get_item_count(self, item_name):
+        """Get the total quantity of an item held in inventory across all stacks."""
+        return self._qty_by_name.get(item_name, 0)
+
     def consume_item_by_name(self, item_name, count=1):
         """
         Consume a specific count of items by name from stacks.
         Returns True if successful, False if not enough items.
         """
-        # Find all matching items
-        total_available = 0
-        matching_items = []
-
-        for i, item in enumerate(self.inventory):
-            if item.name == item_name:
-                total_available += item.quantity
-                matching_items.append((i, item))
-
-        if total_available < count:
+        if self.get_item_count(item_name) < count:
             return False
 
-        # Consume from stacks
+        # Consume from stacks in inventory order
         remaining_to_consume = count
-        items_to_remove = []
+        stacks = self._items_by_name.get(item_name, [])
+        consumed_stacks = []
 
-        for idx, (inv_idx, item) in enumerate(matching_items):
+        for item in stacks:
             if remaining_to_consume <= 0:
                 break
 
             if item.quantity <= remaining_to_consume:
                 # Consume entire stack
                 remaining_to_consume -= item.quantity
-                items_to_remove.append(inv_idx)
+                consumed_stacks.append(item)
+                self.unindex_stack(item)
             else:
-                # Consume partial stack
-                # Calculate value per unit
-                value_per_unit = item.gold_value / item.quantity
-                item.quantity -= remaining_to_consume
-                item.gold_value -= value_per_unit * remaining_to_consume
+                # Consume partial stack, scaling the value down in integer math
+                new_quantity = item.quantity - remaining_to_consume
+                item.gold_value = item.gold_value * new_quantity // item.quantity
+                item.quantity = new_quantity
                 remaining_to_consume = 0
 
-        # Remove consumed stacks (in reverse order to maintain indices)
-        for inv_idx in sorted(items_to_remove, reverse=True):
-            self.inventory.pop(inv_idx)
+        # Drop consumed stacks in place; LootItem has no __eq__, so remove matches by identity
+        if consumed_stacks:
+            inventory = self.inventory
+            for item in consumed_stacks:
+                inventory.remove(item)
+            self._consumable_cache = None
+            if len(consumed_stacks) == len(stacks):
+                del self._items_by_name[item_name]
+            else:
+                del stacks[:len(consumed_stacks)]  # Stacks are consumed from the front
 
+        self._adjust_item_count(item_name, -count)
         return True
 
     def equip_item(self, item):
         """Equip an equipment item."""
         self.equipped_items.append(item)
+        self._effect_cache = None
 
     def unequip_item(self, index):
         """Unequip an equipment item and return it."""
         if 0 <= index < len(self.equipped_items):
+            self._effect_cache = None
             return self.equipped_items.pop(index)
         return None
 
     def consume_upgrade(self, item):
         """Consume an upgrade item permanently."""
         self.consumed_upgrades.append(item)
+        self._effect_cache = None
+
+    def invalidate_effect_cache(self):
+        """Drop cached effect totals. Call after editing enchantments on equipped items or upgrades."""
+        self._effect_cache = None
+
+    def _recompute_effects(self):
+        """Total functional enchantment effects from equipment and upgrades as {effect_type: (flat, percent)}."""
+        columns = {}  # effect_type -> [flat total, percent total], indexed by is_percentage
+        for items in (self.equipped_items, self.consumed_upgrades):
+            for item in items:
+                for ench, _ in item.enchantments:
+                    if ench.enchantment_type == "functional":
+                        columns.setdefault(ench.effect_type, [0, 0])[ench.is_percentage] += ench.value
+        totals = {effect_type: tuple(column) for effect_type, column in columns.items()}
+        self._effect_cache = totals
+        return totals
 
     def get_total_draw_cost_reduction(self):
         """Calculate total draw cost reduction from equipment and upgrades."""
-        flat_reduction = 0
-        percentage_reduction = 0
-
-        # Add effects from equipped items
-        for item in self.equipped_items:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "draw_cost_reduction":
-                    if ench.is_percentage:
-                        percentage_reduction += ench.value
-                    else:
-                        flat_reduction += ench.value
-
-        # Add effects from consumed upgrades
-        for item in self.consumed_upgrades:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "draw_cost_reduction":
-                    if ench.is_percentage:
-                        percentage_reduction += ench.value
-                    else:
-                        flat_reduction += ench.value
-
-        return flat_reduction, percentage_reduction
+        effects = self._effect_cache
+        if effects is None:
+            effects = self._recompute_effects()
+        return effects.get("draw_cost_reduction", (0, 0))
 
     def calculate_draw_cost(self, base_cost):
         """Calculate the actual draw cost after reductions."""
@@ -385,71 +751,24 @@ class Player:
 
     def get_double_quantity_chance(self):
         """Calculate total chance to double item quantity from equipment and upgrades."""
-        total_chance = 0
-
-        # Add effects from equipped items
-        for item in self.equipped_items:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "double_quantity_chance":
-                    total_chance += ench.value
-
-        # Add effects from consumed upgrades
-        for item in self.consumed_upgrades:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "double_quantity_chance":
-                    total_chance += ench.value
-
-        return min(100, total_chance)  # Cap at 100%
+        effects = self._effect_cache
+        if effects is None:
+            effects = self._recompute_effects()
+        return min(100, sum(effects.get("double_quantity_chance", (0, 0))))  # Cap at 100%
 
     def get_sell_price_increase(self):
         """Calculate total sell price increase for non-crafted items from equipment and upgrades."""
-        flat_increase = 0
-        percentage_increase = 0
-
-        # Add effects from equipped items
-        for item in self.equipped_items:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "sell_price_increase":
-                    if ench.is_percentage:
-                        percentage_increase += ench.value
-                    else:
-                        flat_increase += ench.value
-
-        # Add effects from consumed upgrades
-        for item in self.consumed_upgrades:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "sell_price_increase":
-                    if ench.is_percentage:
-                        percentage_increase += ench.value
-                    else:
-                        flat_increase += ench.value
-
-        return flat_increase, percentage_increase
+        effects = self._effect_cache
+        if effects is None:
+            effects = self._recompute_effects()
+        return effects.get("sell_price_increase", (0, 0))
 
     def get_crafted_sell_price_increase(self):
         """Calculate total sell price increase for crafted items from equipment and upgrades."""
-        flat_increase = 0
-        percentage_increase = 0
-
-        # Add effects from equipped items
-        for item in self.equipped_items:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "crafted_sell_price_increase":
-                    if ench.is_percentage:
-                        percentage_increase += ench.value
-                    else:
-                        flat_increase += ench.value
-
-        # Add effects from consumed upgrades
-        for item in self.consumed_upgrades:
-            for ench, _ in item.enchantments:
-                if ench.enchantment_type == "functional" and ench.effect_type == "crafted_sell_price_increase":
-                    if ench.is_percentage:
-                        percentage_increase += ench.value
-                    else:
-                        flat_increase += ench.value
-
-        return flat_increase, percentage_increase
+        effects = self._effect_cache
+        if effects is None:
+            effects = self._recompute_effects()
+        return effects.get("crafted_sell_price_increase", (0, 0))
 
     def calculate_item_value(self, base_value, is_crafted=False):
         """Calculate the actual item value after sell price increases."""
@@ -457,6 +776,8 @@ class Player:
             flat, percent = self.get_crafted_sell_price_increase()
         else:
             flat, percent = self.get_sell_price_increase()
+        if not flat and not percent:
+            return int(base_value)
 
         # Apply percentage increase first
         value = base_value * (1 + percent / 100)
@@ -481,13 +802,87 @@ class LootTable:
         self.name = name
         self.draw_cost = draw_cost
         self.items = []
+        self._cum_weights = None
+        self._excluded_weights = None  # (excluded item, remaining items, their cumulative weights)
+        self._heaviest_item = None  # First item with the highest weight
+        self._items_by_weight = None  # Items sorted by ascending weight, for the rates view
+        self._drop_rates = None  # id(item) -> drop chance formatted as a percentage with 2 decimals
+
+    def to_dict(self, ench_rows=None):
+        return {
+            'name': self.name,
+            'draw_cost': self.draw_cost,
+            'items': _serialize_items(self.items, ench_rows)
+        }
+
+    @classmethod
+    def from_dict(cls, data, load_item):
+        """Rebuild a table saved at SAVE_FORMAT_VERSION; load_item turns one saved item dict into a LootItem."""
+        table = cls(data['name'], data['draw_cost'])
+        table.items = [load_item(item_data) for item_data in data['items']]
+        return table
+
+    def invalidate_cache(self):
+        """Drop cached draw weights; call after mutating self.items directly"""
+        self._cum_weights = None
+        self._excluded_weights = None
+        self._heaviest_item = None
+        self._items_by_weight = None
+        self._drop_rates = None
+
+    def get_cum_weights(self):
+        if self._cum_weights is None:
+            self._cum_weights = list(accumulate(item.weight for item in self.items))
+        return self._cum_weights
+
+    def get_total_weight(self):
+        """Sum of all item weights, read off the cached cumulative weights."""
+        cum_weights = self.get_cum_weights()
+        return cum_weights[-1] if cum_weights else 0
+
+    def get_heaviest_item(self):
+        """The first item with the highest weight (cached), or None for an empty table."""
+        if self._heaviest_item is None and self.items:
+            self._heaviest_item = max(self.items, key=lambda x: x.weight)
+        return self._heaviest_item
+
+    def get_items_by_weight(self):
+        """Items sorted by ascending weight, ties in table order (cached)."""
+        if self._items_by_weight is None:
+            self._items_by_weight = sorted(self.items, key=lambda x: x.weight)
+        return self._items_by_weight
+
+    def get_drop_rates(self):
+        """Map id(item) to its drop chance formatted like "12.50" (cached)."""
+        if self._drop_rates is None:
+            total_weight = self.get_total_weight()
+            self._drop_rates = {id(item): f"{item.weight / total_weight * 100:.2f}" for item in self.items}
+        return self._drop_rates
+
+    def get_excluded_weights(self, exclude):
+        """Items other than exclude and their cumulative weights, cached for the last excluded item."""
+        cached = self._excluded_weights
+        if cached is None or cached[0] is not exclude:
+            items = [item for item in self.items if item is not exclude]
+            cached = self._excluded_weights = (exclude, items, list(accumulate(item.weight for item in items)))
+        return cached[1], cached[2]
 
     def add_item(self, name, weight, gold_value, item_type="misc", quantity=1):
-        self.items.append(LootItem(name, weight, gold_value, item_type, quantity))
+        item = LootItem(name, weight, gold_value, item_type, quantity)
+        self.items.append(item)
+        heaviest = self._heaviest_item
+        self.invalidate_cache()
+        # Update the known maximum instead of rescanning; on a tie the earlier item stays heaviest
+        if heaviest is not None:
+            self._heaviest_item = item if weight > heaviest.weight else heaviest
 
     def remove_item(self, index):
         if 0 <= index < len(self.items):
-            self.items.pop(index)
+            item = self.items.pop(index)
+            heaviest = self._heaviest_item
+            self.invalidate_cache()
+            if heaviest is not item:
+                self._heaviest_item = heaviest
             return True
         return False
 
@@ -495,12 +890,20 @@ class LootTable:
         if 0 <= index < len(self.items):
             if new_name is not None:
                 self.items[index].name = new_name
-            if new_weight is not None:
-                self.items[index].weight = new_weight
+            if new_weight is not None and new_weight != self.items[index].weight:
+                item = self.items[index]
+                heaviest = self._heaviest_item
+                # The maximum only holds if the heaviest item got heavier or another item stayed strictly lighter
+                keep_heaviest = heaviest is not None and (new_weight > heaviest.weight if item is heaviest
+                                                          else new_weight < heaviest.weight)
+                item.weight = new_weight
+                self.invalidate_cache()
+                if keep_heaviest:
+                    self._heaviest_item = heaviest
             if new_gold is not None:
                 self.items[index].gold_value = new_gold
             if new_type is not None:
-                self.items[index].item_type = new_type
+                self.items[index].set_item_type(new_type)
             if new_quantity is not None:
                 self.items[index].quantity = new_quantity
             return True
@@ -509,22 +912,124 @@ class LootTable:
     def draw(self):
         if not self.items:
             return None
-        weights = [item.weight for item in self.items]
-        drawn_item = random.choices(self.items, weights=weights, k=1)[0]
-        return copy.deepcopy(drawn_item)
-
-    def draw_multiple(self, count):
-        if not self.items:
-            return []
-        weights = [item.weight for item in self.items]
-        drawn_items = random.choices(self.items, weights=weights, k=count)
-        return [copy.deepcopy(item) for item in drawn_items]
+        cum_weights = self.get_cum_weights()
+        drawn_item = self.items[bisect(cum_weights, _random() * cum_weights[-1])]
+        return drawn_item.clone()
+
+    def draw_multiple(self, count, exclude=None):
+        if exclude is not None:
+            # Trash to Treasure always excludes the same heaviest item, so its weights are cached too
+            items, cum_weights = self.get_excluded_weights(exclude)
+            if not items:
+                return []
+            drawn_items = _rng.choices(items, cum_weights=cum_weights, k=count)
+        else:
+            if not self.items:
+                return []
+            drawn_items = _rng.choices(self.items, cum_weights=self.get_cum_weights(), k=count)
+        # Every copy is rolled and doubled on its own by the caller, so each draw stays a separate item
+        return list(map(LootItem.clone, drawn_items))
+
+
+def _write_json_entries(f, opener, closer, entries):
+    """Write encoded object/array entries one per line, pulling each from the iterator only when needed."""
+    f.write(opener)
+    separator = b'\n'
+    for entry in entries:
+        f.write(separator + entry)
+        separator = b',\n'
+    f.write(b'\n' + closer)
+
+
+def _build_unified_enchantment(ench_data):
+    """Unified format: every record names its enchantment_type."""
+    get = ench_data.get
+    if ench_data['enchantment_type'] == "monetary":
+        ench = Enchantment(
+            ench_data['name'],
+            "monetary",
+            enchant_type=get('enchant_type', 'misc'),
+            min_value=get('min_value', 0),
+            max_value=get('max_value', 0),
+            is_percentage=get('is_percentage', False),
+            cost_amount=get('cost_amount', 1)
+        )
+        return ench, get('rolled_value', 0)
+    ench = Enchantment(
+        ench_data['name'],
+        "functional",
+        effect_type=get('effect_type', 'draw_cost_reduction'),
+        value=get('value', 0),
+        is_percentage=get('is_percentage', False),
+        weight=get('weight', 1000)
+    )
+    return ench, None  # Functional enchantments don't have rolled values
+
+
+def _build_old_monetary_enchantment(ench_data):
+    """Old format: monetary only, with a min/max range."""
+    get = ench_data.get
+    ench = Enchantment(
+        ench_data['name'],
+        "monetary",
+        enchant_type=get('enchant_type', 'misc'),
+        min_value=ench_data['min_value'],
+        max_value=ench_data['max_value'],
+        is_percentage=get('is_percentage', False),
+        cost_amount=get('cost_amount', 1)
+    )
+    return ench, get('rolled_value', 0)
+
+
+def _build_very_old_enchantment(ench_data):
+    """Very old format: a fixed gold bonus, converted to a monetary enchantment."""
+    get = ench_data.get
+    gold_value = get('gold_value', 0)
+    ench = Enchantment(
+        ench_data['name'],
+        "monetary",
+        enchant_type=get('enchant_type', 'misc'),
+        min_value=gold_value,
+        max_value=gold_value,
+        is_percentage=False,
+        cost_amount=1
+    )
+    return ench, gold_value
+
+
+def _build_effect_template(tmpl_data):
+    """Pre-enchantment effect template, converted to a functional enchantment."""
+    get = tmpl_data.get
+    return Enchantment(
+        tmpl_data['name'],
+        "functional",
+        effect_type=tmpl_data['effect_type'],
+        value=tmpl_data['value'],
+        is_percentage=get('is_percentage', False),
+        weight=get('weight', 1000)
+    )
+
+
+def _legacy_enchantment_builder(sample):
+    """Pick the (enchantment, rolled_value) builder for a list of pre-versioned records.
+
+    Records in one list always come from the same save, so the first one decides.
+    """
+    if 'enchantment_type' in sample:
+        return _build_unified_enchantment
+    if 'min_value' in sample:
+        return _build_old_monetary_enchantment
+    return _build_very_old_enchantment
 
 
 class GameSystem:
     def __init__(self):
         self.master_items = []  # Master item registry
+        self._master_by_name = {}  # Lowercased name -> first master item with that name
+        self._shop_items_cache = None  # Master items with a purchase price
+        self._craftable_items_cache = None  # Master items with a recipe
         self.loot_tables = []  # List of LootTable objects
+        self._tables_by_name = {}  # Table name -> first loot table with that name
         self.current_table_index = 0  # Currently selected table
         self.current_player_name = None  # Currently selected player
         self.players = {}
@@ -534,7 +1039,14 @@ class GameSystem:
         self.functional_enchant_cost = 100  # Currency cost to roll for a functional enchantment when crafting
         self.rarity_system = RaritySystem()  # Rarity system for equipment
         self.consumables = []  # Consumable items with temporary effects
+        self._consumables_by_name = {}  # Consumable name -> first consumable with that name
         self.save_file = "loot_system_save_new.json"
+        self.pretty_save = False  # Indent the save file for hand inspection (--pretty)
+        self._functional_roll_cache = None  # (functional enchantments, cumulative weights)
+        self._compatible_enchant_cache = {}  # item_type -> compatible monetary enchantments
+        self._all_items_cache = None  # Every item across all loot tables
+        self._all_item_names_cache = None  # Sorted unique names of every item across all loot tables
+        self._save_cache = {}  # Save section name -> serialized rows, for sections that only change in editors
 
     def get_current_table(self):
         if self.loot_tables:
@@ -544,8 +1056,37 @@ class GameSystem:
     def add_loot_table(self, name, draw_cost=100):
         table = LootTable(name, draw_cost)
         self.loot_tables.append(table)
+        self._tables_by_name.setdefault(name, table)
+        self.invalidate_item_cache()
         return table
 
+    def get_loot_table(self, name):
+        """Get a loot table by name."""
+        return self._tables_by_name.get(name)
+
+    def reindex_loot_tables(self):
+        """Rebuild the table name lookup. Call after renaming, removing or replacing tables."""
+        self._tables_by_name = {}
+        for table in self.loot_tables:
+            self._tables_by_name.setdefault(table.name, table)
+
+    def invalidate_item_cache(self):
+        """Drop cached loot table item lists. Call after editing tables or their items."""
+        self._all_items_cache = None
+        self._all_item_names_cache = None
+
+    def get_all_items(self):
+        """Get every item from every loot table (cached)."""
+        if self._all_items_cache is None:
+            self._all_items_cache = [item for table in self.loot_tables for item in table.items]
+        return self._all_items_cache
+
+    def get_all_item_names(self):
+        """Get the sorted, de-duplicated names of every item from every loot table (cached)."""
+        if self._all_item_names_cache is None:
+            self._all_item_names_cache = tuple(sorted({item.name for item in self.get_all_items()}))
+        return self._all_item_names_cache
+
     def add_player(self, name):
         if name not in self.players:
             self.players[name] = Player(name)
@@ -567,94 +1108,130 @@ class GameSystem:
     def add_master_item(self, name, item_type, gold_value_per_unit, purchase_price=None):
         """Add a new master item to the registry."""
         # Check if item already exists
-        for item in self.master_items:
-            if item.name.lower() == name.lower():
-                return None  # Item already exists
+        key = name.lower()
+        if key in self._master_by_name:
+            return None  # Item already exists
         master_item = MasterItem(name, item_type, gold_value_per_unit, purchase_price)
         self.master_items.append(master_item)
+        self._master_by_name[key] = master_item
+        self.invalidate_master_item_cache()
         return master_item
 
     def get_master_item(self, name):
         """Get a master item by name."""
-        for item in self.master_items:
-            if item.name.lower() == name.lower():
-                return item
-        return None
+        return self._master_by_name.get(name.lower())
 
     def remove_master_item(self, index):
         """Remove a master item by index."""
         if 0 <= index < len(self.master_items):
-            return self.master_items.pop(index)
+            item = self.master_items.pop(index)
+            self.reindex_master_items()
+            return item
         return None
 
+    def reindex_master_items(self):
+        """Rebuild the name lookup. Call after renaming or replacing master items."""
+        self._master_by_name = {}
+        for item in self.master_items:
+            self._master_by_name.setdefault(item.name.lower(), item)
+        self.invalidate_master_item_cache()
+
+    def invalidate_master_item_cache(self):
+        """Drop cached master item views. Call after adding, removing or editing master items."""
+        self._shop_items_cache = None
+        self._craftable_items_cache = None
+        self.invalidate_save_cache('master_items')
+
+    def get_shop_items(self):
+        """Get the master items that have a purchase price (cached)."""
+        if self._shop_items_cache is None:
+            self._shop_items_cache = [item for item in self.master_items if item.purchase_price is not None]
+        return self._shop_items_cache
+
+    def get_craftable_items(self):
+        """Get the master items that have a recipe (cached)."""
+        if self._craftable_items_cache is None:
+            self._craftable_items_cache = [item for item in self.master_items if item.recipe]
+        return self._craftable_items_cache
+
+    def invalidate_enchantment_cache(self):
+        """Drop cached enchantment data. Call after editing self.enchantments."""
+        self._functional_roll_cache = None
+        self._compatible_enchant_cache = {}
+        self.invalidate_save_cache('enchantments')
+        LootItem.invalidate_display_caches()
+        # Equipped items and upgrades share these Enchantment objects, so their totals may have changed
+        for player in self.players.values():
+            player.invalidate_effect_cache()
+
+    def get_consumable(self, name):
+        """Get a consumable definition by name."""
+        return self._consumables_by_name.get(name)
+
+    def reindex_consumables(self):
+        """Rebuild the consumable name lookup. Call after adding, renaming or removing consumables."""
+        self._consumables_by_name = {}
+        for cons in self.consumables:
+            self._consumables_by_name.setdefault(cons.name, cons)
+        self.invalidate_save_cache('consumables')
+
+    def invalidate_save_cache(self, section):
+        """Drop the cached rows of a save section ('master_items', 'enchantments' or 'consumables').
+
+        Call after editing the matching list or anything in it.
+        """
+        self._save_cache.pop(section, None)
+
+    def _cached_section(self, section, build):
+        """Serialized rows for a save section, rebuilt only after invalidate_save_cache."""
+        rows = self._save_cache.get(section)
+        if rows is None:
+            rows = self._save_cache[section] = build()
+        return rows
+
+    def get_functional_enchantments(self):
+        """Get functional enchantments and their cumulative roll weights (cached)."""
+        if self._functional_roll_cache is None:
+            functional = [e for e in self.enchantments if e.enchantment_type == "functional"]
+            cum_weights = list(accumulate(e.weight for e in functional))
+            self._functional_roll_cache = (functional, cum_weights)
+        return self._functional_roll_cache
+
+    def get_compatible_enchantments(self, item_type):
+        """Get enchantments that can be applied to an item type (cached per type)."""
+        compatible = self._compatible_enchant_cache.get(item_type)
+        if compatible is None:
+            compatible = [e for e in self.enchantments if e.enchant_type == item_type or e.enchant_type == "misc"]
+            self._compatible_enchant_cache[item_type] = compatible
+        return compatible
+
+    def roll_functional_enchantment(self):
+        """Roll a random functional enchantment by weight. Returns None if none exist."""
+        functional, cum_weights = self.get_functional_enchantments()
+        if not functional:
+            return None
+        return functional[bisect(cum_weights, _random() * cum_weights[-1])]
+
     def _load_item_from_data(self, item_data):
         """Helper to load a LootItem from saved data with enchantments (monetary and functional)."""
+        get = item_data.get
         item = LootItem(
             item_data['name'],
             item_data['weight'],
             item_data['gold_value'],
-            item_data.get('item_type', 'misc'),
-            item_data.get('quantity', 1),
-            item_data.get('rarity')
+            get('item_type', 'misc'),
+            get('quantity', 1),
+            get('rarity')
         )
 
         # Load enchantments (both monetary and functional)
-        for ench_data in item_data.get('enchantments', []):
-            # Check if this is new unified format or old format
-            if 'enchantment_type' in ench_data:
-                # New unified format
-                ench_type = ench_data['enchantment_type']
-                if ench_type == "monetary":
-                    ench = Enchantment(
-                        ench_data['name'],
-                        "monetary",
-                        enchant_type=ench_data.get('enchant_type', 'misc'),
-                        min_value=ench_data.get('min_value', 0),
-                        max_value=ench_data.get('max_value', 0),
-                        is_percentage=ench_data.get('is_percentage', False),
-                        cost_amount=ench_data.get('cost_amount', 1)
-                    )
-                    rolled_value = ench_data.get('rolled_value', 0)
-                else:  # functional
-                    ench = Enchantment(
-                        ench_data['name'],
-                        "functional",
-                        effect_type=ench_data.get('effect_type', 'draw_cost_reduction'),
-                        value=ench_data.get('value', 0),
-                        is_percentage=ench_data.get('is_percentage', False),
-                        weight=ench_data.get('weight', 1000)
-                    )
-                    rolled_value = None  # Functional enchantments don't have rolled values
-                item.enchantments.append((ench, rolled_value))
-            elif 'min_value' in ench_data:
-                # Old monetary enchantment format
-                ench = Enchantment(
-                    ench_data['name'],
-                    "monetary",
-                    enchant_type=ench_data.get('enchant_type', 'misc'),
-                    min_value=ench_data['min_value'],
-                    max_value=ench_data['max_value'],
-                    is_percentage=ench_data.get('is_percentage', False),
-                    cost_amount=ench_data.get('cost_amount', 1)
-                )
-                rolled_value = ench_data.get('rolled_value', 0)
-                item.enchantments.append((ench, rolled_value))
-            else:
-                # Very old format - convert to monetary
-                gold_value = ench_data.get('gold_value', 0)
-                ench = Enchantment(
-                    ench_data['name'],
-                    "monetary",
-                    enchant_type=ench_data.get('enchant_type', 'misc'),
-                    min_value=gold_value,
-                    max_value=gold_value,
-                    is_percentage=False,
-                    cost_amount=1
-                )
-                item.enchantments.append((ench, gold_value))
+        records = get('enchantments', [])
+        if records:
+            build = _legacy_enchantment_builder(records[0])
+            item.enchantments.extend(build(ench_data) for ench_data in records)
 
         # Load old effects and convert to functional enchantments (backward compatibility)
-        for eff_data in item_data.get('effects', []):
+        for eff_data in get('effects', []):
             ench = Enchantment(
                 f"{eff_data['effect_type']}",  # Use effect_type as name
                 "functional",
@@ -667,168 +1244,63 @@ class GameSystem:
 
         return item
 
+    def _save_sections(self):
+        """Yield the save file's top-level (key, value) pairs in file order.
+
+        'players' is yielded as a generator of (name, record) pairs and 'loot_tables'
+        as a generator of records, so save_game can write one player or table at a time.
+        """
+        ench_rows = {}  # Shared Enchantment objects are serialized once per save
+        yield 'format_version', SAVE_FORMAT_VERSION
+        yield 'master_items', self._cached_section(
+            'master_items', lambda: [item.to_dict() for item in self.master_items])
+        yield 'loot_tables', (table.to_dict(ench_rows) for table in self.loot_tables)
+        yield 'current_table_index', self.current_table_index
+        yield 'current_player_name', self.current_player_name
+        yield 'players', ((name, player.to_dict(ench_rows)) for name, player in self.players.items())
+        yield 'enchantments', self._cached_section(
+            'enchantments', lambda: [_enchantment_row(ench, ench_rows) for ench in self.enchantments])
+        yield 'enchant_cost_item', self.enchant_cost_item
+        yield 'enchant_cost_amount', self.enchant_cost_amount
+        yield 'functional_enchant_cost', self.functional_enchant_cost
+        yield 'consumables', self._cached_section(
+            'consumables', lambda: [cons.to_dict() for cons in self.consumables])
+        yield 'rarity_weights', self.rarity_system.get_weights()
+
     def save_game(self):
         """Save the game state to a JSON file."""
+        # Write beside the real file and swap it in at the end, so a crash mid-save leaves the old save intact
+        tmp_path = self.save_file + ".tmp"
         try:
-            data = {
-                'master_items': [
-                    {
-                        'name': item.name,
-                        'item_type': item.item_type,
-                        'gold_value_per_unit': item.gold_value_per_unit,
-                        'purchase_price': item.purchase_price,
-                        'recipe': item.recipe
-                    }
-                    for item in self.master_items
-                ],
-                'loot_tables': [
-                    {
-                        'name': table.name,
-                        'draw_cost': table.draw_cost,
-                        'items': [
-                            {
-                                'name': item.name,
-                                'weight': item.weight,
-                                'gold_value': item.gold_value,
-                                'item_type': item.item_type,
-                                'quantity': item.quantity,
-                                'rarity': item.rarity
-                            }
-                            for item in table.items
-                        ]
-                    }
-                    for table in self.loot_tables
-                ],
-                'current_table_index': self.current_table_index,
-                'current_player_name': self.current_player_name,
-                'players': {
-                    name: {
-                        'gold': player.gold,
-                        'inventory': [
-                            {
-                                'name': item.name,
-                                'weight': item.weight,
-                                'gold_value': item.gold_value,
-                                'item_type': item.item_type,
-                                'quantity': item.quantity,
-                                'rarity': item.rarity,
-                                'enchantments': [
-                                    {
-                                        'name': ench.name,
-                                        'enchantment_type': ench.enchantment_type,
-                                        'enchant_type': ench.enchant_type,
-                                        'min_value': ench.min_value,
-                                        'max_value': ench.max_value,
-                                        'effect_type': ench.effect_type,
-                                        'value': ench.value,
-                                        'weight': ench.weight,
-                                        'is_percentage': ench.is_percentage,
-                                        'cost_amount': ench.cost_amount,
-                                        'rolled_value': rolled_value
-                                    }
-                                    for ench, rolled_value in item.enchantments
-                                ]
-                            }
-                            for item in player.inventory
-                        ],
-                        'equipped_items': [
-                            {
-                                'name': item.name,
-                                'weight': item.weight,
-                                'gold_value': item.gold_value,
-                                'item_type': item.item_type,
-                                'quantity': item.quantity,
-                                'rarity': item.rarity,
-                                'enchantments': [
-                                    {
-                                        'name': ench.name,
-                                        'enchantment_type': ench.enchantment_type,
-                                        'enchant_type': ench.enchant_type,
-                                        'min_value': ench.min_value,
-                                        'max_value': ench.max_value,
-                                        'effect_type': ench.effect_type,
-                                        'value': ench.value,
-                                        'weight': ench.weight,
-                                        'is_percentage': ench.is_percentage,
-                                        'cost_amount': ench.cost_amount,
-                                        'rolled_value': rolled_value
-                                    }
-                                    for ench, rolled_value in item.enchantments
-                                ]
-                            }
-                            for item in player.equipped_items
-                        ],
-                        'consumed_upgrades': [
-                            {
-                                'name': item.name,
-                                'weight': item.weight,
-                                'gold_value': item.gold_value,
-                                'item_type': item.item_type,
-                                'quantity': item.quantity,
-                                'rarity': item.rarity,
-                                'enchantments': [
-                                    {
-                                        'name': ench.name,
-                                        'enchantment_type': ench.enchantment_type,
-                                        'enchant_type': ench.enchant_type,
-                                        'min_value': ench.min_value,
-                                        'max_value': ench.max_value,
-                                        'effect_type': ench.effect_type,
-                                        'value': ench.value,
-                                        'weight': ench.weight,
-                                        'is_percentage': ench.is_percentage,
-                                        'cost_amount': ench.cost_amount,
-                                        'rolled_value': rolled_value
-                                    }
-                                    for ench, rolled_value in item.enchantments
-                                ]
-                            }
-                            for item in player.consumed_upgrades
-                        ],
-                        'active_consumable_effects': player.active_consumable_effects
-                    }
-                    for name, player in self.players.items()
-                },
-                'enchantments': [
-                    {
-                        'name': ench.name,
-                        'enchantment_type': ench.enchantment_type,
-                        'enchant_type': ench.enchant_type,
-                        'min_value': ench.min_value,
-                        'max_value': ench.max_value,
-                        'effect_type': ench.effect_type,
-                        'value': ench.value,
-                        'weight': ench.weight,
-                        'is_percentage': ench.is_percentage,
-                        'cost_amount': ench.cost_amount
-                    }
-                    for ench in self.enchantments
-                ],
-                'enchant_cost_item': self.enchant_cost_item,
-                'enchant_cost_amount': self.enchant_cost_amount,
-                'functional_enchant_cost': self.functional_enchant_cost,
-                'consumables': [
-                    {
-                        'name': cons.name,
-                        'effect_type': cons.effect_type,
-                        'effect_value': cons.effect_value,
-                        'gold_value': cons.gold_value,
-                        'table_name': cons.table_name
-                    }
-                    for cons in self.consumables
-                ],
-                'rarity_weights': {
-                    rarity: data['weight']
-                    for rarity, data in self.rarity_system.rarities.items()
-                }
-            }
-
-            with open(self.save_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            pretty = self.pretty_save
+            compress = self.save_file.endswith(".zst")
+            if compress and zstd is None:
+                raise RuntimeError("the zstandard package is required for .zst saves")
+            # Large buffer so the per-section writes below reach the OS in a few big chunks
+            f = open(tmp_path, 'wb', buffering=1 << 20)
+            if compress:
+                f = zstd.ZstdCompressor(level=3).stream_writer(f)  # Closing it closes the file too
+            with f:
+                # Write section by section (players and tables one at a time) instead of building one big dict
+                f.write(b'{\n')
+                for i, (key, value) in enumerate(self._save_sections()):
+                    if i:
+                        f.write(b',\n')
+                    f.write(dump_json(key) + b': ')
+                    if key == 'players':
+                        _write_json_entries(f, b'{', b'}', (dump_json(name) + b': ' + dump_json(record, pretty)
+                                                            for name, record in value))
+                    elif key == 'loot_tables':
+                        _write_json_entries(f, b'[', b']', (dump_json(record, pretty) for record in value))
+                    else:
+                        f.write(dump_json(value, pretty))
+                f.write(b'\n}\n')
+            os.replace(tmp_path, self.save_file)
             return True
         except Exception as e:
             print(f"Error saving: {e}")
-            import traceback
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             traceback.print_exc()
             return False
 
@@ -838,38 +1310,36 @@ class GameSystem:
             return False
 
         try:
-            with open(self.save_file, 'r') as f:
-                data = json.load(f)
+            with open(self.save_file, 'rb') as f:
+                raw = f.read()
+            # Compressed saves are recognized by content, so renamed files still load
+            if raw[:4] == ZSTD_MAGIC:
+                if zstd is None:
+                    raise RuntimeError("the zstandard package is required to load this compressed save")
+                raw = zstd.ZstdDecompressor().decompressobj().decompress(raw)
+            data = load_json(raw)
+
+            # Pick the item loader once for the whole file
+            current_format = data.get('format_version') == SAVE_FORMAT_VERSION
+            load_item = LootItem.from_dict if current_format else self._load_item_from_data
 
             # Load master items
-            self.master_items = []
-            if 'master_items' in data:
-                for item_data in data['master_items']:
-                    master_item = MasterItem(
-                        item_data['name'],
-                        item_data['item_type'],
-                        item_data['gold_value_per_unit'],
-                        item_data.get('purchase_price'),  # Backward compatible
-                        item_data.get('recipe', [])  # Backward compatible
-                    )
-                    self.master_items.append(master_item)
+            self.master_items = [MasterItem.from_dict(item_data) for item_data in data.get('master_items', [])]
+            self.reindex_master_items()
 
             # Load loot tables (with backward compatibility)
             self.loot_tables = []
-            if 'loot_tables' in data:
+            if current_format:
+                # Versioned saves always carry every section and field, so skip the defaults
+                self.loot_tables = [LootTable.from_dict(table_data, load_item) for table_data in data['loot_tables']]
+                self.current_table_index = data['current_table_index']
+                self.current_player_name = data['current_player_name']
+            elif 'loot_tables' in data:
                 # New format: multiple tables
                 for table_data in data['loot_tables']:
                     table = LootTable(table_data.get('name', 'Default'), table_data.get('draw_cost', 100))
                     for item_data in table_data.get('items', []):
-                        item = LootItem(
-                            item_data['name'],
-                            item_data['weight'],
-                            item_data['gold_value'],
-                            item_data.get('item_type', 'misc'),
-                            item_data.get('quantity', 1),
-                            item_data.get('rarity')
-                        )
-                        table.items.append(item)
+                        table.items.append(load_item(item_data))
                     self.loot_tables.append(table)
                 self.current_table_index = data.get('current_table_index', 0)
                 self.current_player_name = data.get('current_player_name')
@@ -877,15 +1347,7 @@ class GameSystem:
                 # Old format: single table - convert it
                 table = LootTable("Default", 100)
                 for item_data in data.get('loot_table', []):
-                    item = LootItem(
-                        item_data['name'],
-                        item_data['weight'],
-                        item_data['gold_value'],
-                        item_data.get('item_type', 'misc'),
-                        item_data.get('quantity', 1),
-                        item_data.get('rarity')
-                    )
-                    table.items.append(item)
+                    table.items.append(load_item(item_data))
                 self.loot_tables.append(table)
                 self.current_table_index = 0
 
@@ -893,95 +1355,24 @@ class GameSystem:
             if not self.loot_tables:
                 self.loot_tables.append(LootTable("Default", 100))
                 self.current_table_index = 0
+            self.reindex_loot_tables()
+            self.invalidate_item_cache()
 
             # Load players
             self.players = {}
             for name, player_data in data.get('players', {}).items():
-                player = Player(name)
-                player.gold = player_data['gold']
-
-                # Load inventory
-                for item_data in player_data.get('inventory', []):
-                    item = self._load_item_from_data(item_data)
-                    player.add_item(item)
-
-                # Load equipped items
-                for item_data in player_data.get('equipped_items', []):
-                    item = self._load_item_from_data(item_data)
-                    player.equip_item(item)
-
-                # Load consumed upgrades
-                for item_data in player_data.get('consumed_upgrades', []):
-                    item = self._load_item_from_data(item_data)
-                    player.consume_upgrade(item)
-
-                # Load active consumable effects
-                player.active_consumable_effects = player_data.get('active_consumable_effects', [])
-
-                self.players[name] = player
+                self.players[name] = Player.from_dict(name, player_data, load_item)
 
             # Load enchantments (both monetary and functional)
-            self.enchantments = []
-            for ench_data in data.get('enchantments', []):
-                # Check if this is new unified format or old format
-                if 'enchantment_type' in ench_data:
-                    # New unified format
-                    ench_type = ench_data['enchantment_type']
-                    if ench_type == "monetary":
-                        ench = Enchantment(
-                            ench_data['name'],
-                            "monetary",
-                            enchant_type=ench_data.get('enchant_type', 'misc'),
-                            min_value=ench_data.get('min_value', 0),
-                            max_value=ench_data.get('max_value', 0),
-                            is_percentage=ench_data.get('is_percentage', False),
-                            cost_amount=ench_data.get('cost_amount', 1)
-                        )
-                    else:  # functional
-                        ench = Enchantment(
-                            ench_data['name'],
-                            "functional",
-                            effect_type=ench_data.get('effect_type', 'draw_cost_reduction'),
-                            value=ench_data.get('value', 0),
-                            is_percentage=ench_data.get('is_percentage', False),
-                            weight=ench_data.get('weight', 1000)
-                        )
-                elif 'min_value' in ench_data:
-                    # Old monetary enchantment format
-                    ench = Enchantment(
-                        ench_data['name'],
-                        "monetary",
-                        enchant_type=ench_data.get('enchant_type', 'misc'),
-                        min_value=ench_data['min_value'],
-                        max_value=ench_data['max_value'],
-                        is_percentage=ench_data.get('is_percentage', False),
-                        cost_amount=ench_data.get('cost_amount', 1)
-                    )
-                else:
-                    # Very old format - convert to monetary
-                    gold_value = ench_data.get('gold_value', 0)
-                    ench = Enchantment(
-                        ench_data['name'],
-                        "monetary",
-                        enchant_type=ench_data.get('enchant_type', 'misc'),
-                        min_value=gold_value,
-                        max_value=gold_value,
-                        is_percentage=False,
-                        cost_amount=1
-                    )
-                self.enchantments.append(ench)
-
-            # Load old effect_templates and convert to functional enchantments (backward compatibility)
-            for eff_tmpl_data in data.get('effect_templates', []):
-                ench = Enchantment(
-                    eff_tmpl_data['name'],
-                    "functional",
-                    effect_type=eff_tmpl_data['effect_type'],
-                    value=eff_tmpl_data['value'],
-                    is_percentage=eff_tmpl_data.get('is_percentage', False),
-                    weight=eff_tmpl_data.get('weight', 1000)
-                )
-                self.enchantments.append(ench)
+            records = data.get('enchantments', [])
+            if current_format:
+                self.enchantments = [Enchantment.from_dict(ench_data) for ench_data in records]
+            else:
+                # Older saves may also carry effect_templates, which become functional enchantments
+                build = _legacy_enchantment_builder(records[0]) if records else None
+                self.enchantments = [build(ench_data)[0] for ench_data in records]
+                self.enchantments.extend(map(_build_effect_template, data.get('effect_templates', [])))
+            self.invalidate_enchantment_cache()
 
             # Load global enchantment cost
             self.enchant_cost_item = data.get('enchant_cost_item')
@@ -991,16 +1382,8 @@ class GameSystem:
             self.functional_enchant_cost = data.get('functional_enchant_cost', data.get('effect_cost', 100))
 
             # Load consumables
-            self.consumables = []
-            for cons_data in data.get('consumables', []):
-                consumable = Consumable(
-                    cons_data['name'],
-                    cons_data['effect_type'],
-                    cons_data.get('effect_value'),
-                    cons_data.get('gold_value', 0),
-                    cons_data.get('table_name')  # Backward compatibility: None if not present
-                )
-                self.consumables.append(consumable)
+            self.consumables = [Consumable.from_dict(cons_data) for cons_data in data.get('consumables', [])]
+            self.reindex_consumables()
 
             # Load rarity weights
             if 'rarity_weights' in data:
@@ -1010,27 +1393,74 @@ class GameSystem:
             return True
         except Exception as e:
             print(f"Error loading: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
 
+def read_input(prompt=""):
+    """Read a line like input(), but take piped stdin from one buffered line iterator.
+
+    When stdin is a terminal this is just input().
+    """
+    global _piped_lines
+    if _piped_lines is None:
+        _piped_lines = False if sys.stdin.isatty() else iter(sys.stdin)
+    if _piped_lines is False:
+        return input(prompt)
+    sys.stdout.write(prompt)
+    line = next(_piped_lines, None)
+    if line is None:
+        raise EOFError  # Same as input() at end of input
+    return line[:-1] if line.endswith("\n") else line
+
+
 def get_player_name_input(game, prompt="Enter player name"):
     """Get player name from user, defaulting to current player if set."""
     if game.current_player_name and game.current_player_name in game.players:
         default_prompt = f"{prompt} (default: {game.current_player_name}): "
-        player_name = input(default_prompt).strip()
+        player_name = read_input(default_prompt).strip()
         # If empty, use current player
         if not player_name:
             return game.current_player_name
         return player_name
     else:
-        return input(f"{prompt}: ").strip()
+        return read_input(f"{prompt}: ").strip()
+
+
+def show_available_players(game, show_gold=False, show_items=False):
+    """List players by name, marking the current player."""
+    lines = ["\nAvailable players:"]
+    for name, player in game.players.items():
+        details = []
+        if show_gold:
+            details.append(f"{player.gold}g")
+        if show_items:
+            details.append(f"{len(player.inventory)} items")
+        details_str = f" ({', '.join(details)})" if details else ""
+        current_marker = " <-- CURRENT" if name == game.current_player_name else ""
+        lines.append(f"  - {name}{details_str}{current_marker}")
+    print("\n".join(lines))
+
+
+def prompt_int(prompt, lo=None, hi=None, error="Invalid input!", range_error=None):
+    """Prompt for an integer in [lo, hi].
+
+    Prints an error and returns None if the input is not a number or is out of range.
+    """
+    try:
+        value = int(read_input(prompt).strip())
+    except ValueError:
+        print(error)
+        return None
+    if (lo is not None and value < lo) or (hi is not None and value > hi):
+        print(range_error or error)
+        return None
+    return value
 
 
 def show_context_header(game):
     """Display current player and table context."""
-    print("\n" + "=" * 60)
+    print("\n" + SEP)
 
     # Current Player info
     if game.current_player_name and game.current_player_name in game.players:
@@ -1046,60 +1476,70 @@ def show_context_header(game):
     else:
         print("Current Table: None")
 
-    print("=" * 60)
+    print(SEP)
+
+
+_MAIN_MENU = "\n".join([
+    "\n" + "=" * 40,
+    "LOOT TABLE SYSTEM",
+    "=" * 40,
+    "1. Quick Turn",
+    "2. Manage Loot Table",
+    "3. Manage Players",
+    "4. Draw Items",
+    "5. Shop",
+    "6. Sell Items",
+    "7. Crafting Menu",
+    "8. Equipment & Upgrades",
+    "9. Admin Menu",
+    "10. Save Game",
+    "11. Exit",
+    "=" * 40,
+])
 
 
 def show_main_menu():
-    print("\n" + "=" * 40)
-    print("LOOT TABLE SYSTEM")
-    print("=" * 40)
-    print("1. Quick Turn")
-    print("2. Manage Loot Table")
-    print("3. Manage Players")
-    print("4. Draw Items")
-    print("5. Shop")
-    print("6. Sell Items")
-    print("7. Crafting Menu")
-    print("8. Equipment & Upgrades")
-    print("9. Admin Menu")
-    print("10. Save Game")
-    print("11. Exit")
-    print("=" * 40)
+    print(_MAIN_MENU)
+
+
+_MASTER_ITEMS_MENU = "\n".join([
+    "\n--- MASTER ITEMS REGISTRY ---",
+    "1. Add master item",
+    "2. Edit master item",
+    "3. Delete master item",
+    "4. View all master items",
+    "5. Back to loot table menu",
+])
 
 
 def show_master_items_menu():
-    print("\n--- MASTER ITEMS REGISTRY ---")
-    print("1. Add master item")
-    print("2. Edit master item")
-    print("3. Delete master item")
-    print("4. View all master items")
-    print("5. Back to loot table menu")
+    print(_MASTER_ITEMS_MENU)
 
 
 def manage_master_items(game):
     """Manage the master items registry."""
     while True:
         show_master_items_menu()
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # Add master item
-            name = input("Enter item name: ").strip()
+            name = read_input("Enter item name: ").strip()
             if not name:
                 print("Name cannot be empty!")
                 continue
 
-            item_type = input("Enter item type (misc/equipment/upgrade/consumable): ").strip()
+            item_type = read_input("Enter item type (misc/equipment/upgrade/consumable): ").strip()
             if not item_type:
                 item_type = "misc"
 
             try:
-                gold_per_unit = int(input(f"Enter gold value per unit (sell price): ").strip())
+                gold_per_unit = int(read_input(f"Enter gold value per unit (sell price): ").strip())
                 if gold_per_unit < 0:
                     print(f"Gold value cannot be negative!")
                     continue
 
-                purchase_input = input(f"Enter shop purchase price (leave blank for not for sale): ").strip()
+                purchase_input = read_input(f"Enter shop purchase price (leave blank for not for sale): ").strip()
                 purchase_price = None
                 if purchase_input:
                     purchase_price = int(purchase_input)
@@ -1126,7 +1566,7 @@ def manage_master_items(game):
                 print(f"  {i}. {item.name} ({item.item_type}) - {item.gold_value_per_unit}g each")
 
             try:
-                index = int(input("\nEnter item number to edit: ").strip())
+                index = int(read_input("\nEnter item number to edit: ").strip())
                 if index < 0 or index >= len(game.master_items):
                     print("Invalid item number!")
                     continue
@@ -1135,24 +1575,30 @@ def manage_master_items(game):
                 print(f"\nEditing: {item.name}")
                 print("Leave blank to keep current value")
 
-                new_name = input(f"New name [{item.name}]: ").strip()
-                new_type = input(f"New type [{item.item_type}]: ").strip()
-                new_gold = input(f"New gold per unit [{item.gold_value_per_unit}g]: ").strip()
+                new_name = read_input(f"New name [{item.name}]: ").strip()
+                new_type = read_input(f"New type [{item.item_type}]: ").strip()
+                new_gold = read_input(f"New gold per unit [{item.gold_value_per_unit}g]: ").strip()
 
                 purchase_display = f"{item.purchase_price}g" if item.purchase_price is not None else "not for sale"
-                new_purchase = input(f"New shop purchase price [{purchase_display}]: ").strip()
+                new_purchase = read_input(f"New shop purchase price [{purchase_display}]: ").strip()
+
+                # Parse before changing anything, so a bad value leaves the item and the caches as they were
+                gold_value = int(new_gold) if new_gold else item.gold_value_per_unit
+                if not new_purchase:
+                    purchase_price = item.purchase_price
+                elif new_purchase.lower() == 'none':
+                    purchase_price = None
+                else:
+                    purchase_price = int(new_purchase)
 
                 if new_name:
                     item.name = new_name
+                    game.reindex_master_items()
                 if new_type:
-                    item.item_type = new_type
-                if new_gold:
-                    item.gold_value_per_unit = int(new_gold)
-                if new_purchase:
-                    if new_purchase.lower() == 'none':
-                        item.purchase_price = None
-                    else:
-                        item.purchase_price = int(new_purchase)
+                    item.set_item_type(new_type)
+                item.gold_value_per_unit = gold_value
+                item.purchase_price = purchase_price
+                game.invalidate_master_item_cache()
 
                 print(f"✓ Updated: {item}")
             except ValueError:
@@ -1169,7 +1615,7 @@ def manage_master_items(game):
                 print(f"  {i}. {item.name} ({item.item_type}) - {item.gold_value_per_unit}g each")
 
             try:
-                index = int(input("\nEnter item number to delete: ").strip())
+                index = int(read_input("\nEnter item number to delete: ").strip())
                 deleted = game.remove_master_item(index)
                 if deleted:
                     print(f"✓ Deleted: {deleted.name}")
@@ -1184,12 +1630,11 @@ def manage_master_items(game):
                 print("No master items exist!")
                 continue
 
-            print(f"\n{'=' * 60}")
-            print("MASTER ITEMS REGISTRY")
-            print(f"{'=' * 60}")
-            for i, item in enumerate(game.master_items):
-                print(f"{i}. {item.name} ({item.item_type}) - {item.gold_value_per_unit}g each")
-            print(f"{'=' * 60}")
+            lines = ["\n" + SEP, "MASTER ITEMS REGISTRY", SEP]
+            lines.extend(f"{i}. {item.name} ({item.item_type}) - {item.gold_value_per_unit}g each"
+                         for i, item in enumerate(game.master_items))
+            lines.append(SEP)
+            print("\n".join(lines))
 
         elif choice == "5":
             break
@@ -1197,77 +1642,107 @@ def manage_master_items(game):
             print("Invalid choice!")
 
 
+_LOOT_MENU = "\n".join([
+    "\n--- LOOT TABLE MENU ---",
+    "1. Select/Create loot table",
+    "2. Manage Master Items Registry",
+    "3. Manage Consumables",
+    "4. Add item to current table",
+    "5. Edit item in current table",
+    "6. Delete item from current table",
+    "7. Edit table settings (name, draw cost)",
+    "8. Delete current table",
+    "9. View all items in current table (with weights)",
+    "10. View rates for players (percentages only)",
+    "11. View all tables",
+    "12. Back to main menu",
+])
+
+
 def show_loot_menu():
-    print("\n--- LOOT TABLE MENU ---")
-    print("1. Select/Create loot table")
-    print("2. Manage Master Items Registry")
-    print("3. Manage Consumables")
-    print("4. Add item to current table")
-    print("5. Edit item in current table")
-    print("6. Delete item from current table")
-    print("7. Edit table settings (name, draw cost)")
-    print("8. Delete current table")
-    print("9. View all items in current table (with weights)")
-    print("10. View rates for players (percentages only)")
-    print("11. View all tables")
-    print("12. Back to main menu")
+    print(_LOOT_MENU)
+
+
+_PLAYER_MENU = "\n".join([
+    "\n--- PLAYER MENU ---",
+    "1. Add player",
+    "2. Remove player",
+    "3. View player info",
+    "4. View all players",
+    "5. Set current player",
+    "6. Use consumable",
+    "7. Back to main menu",
+])
 
 
 def show_player_menu():
-    print("\n--- PLAYER MENU ---")
-    print("1. Add player")
-    print("2. Remove player")
-    print("3. View player info")
-    print("4. View all players")
-    print("5. Set current player")
-    print("6. Use consumable")
-    print("7. Back to main menu")
+    print(_PLAYER_MENU)
+
+
+_ADMIN_MENU = "\n".join([
+    "\n--- ADMIN MENU ---",
+    "1. Give gold to player",
+    "2. Take gold from player",
+    "3. Gift item to player",
+    "4. Take item from player",
+    "5. Configure rarity weights",
+    "6. Manage shop",
+    "7. Back to main menu",
+])
 
 
 def show_admin_menu():
-    print("\n--- ADMIN MENU ---")
-    print("1. Give gold to player")
-    print("2. Take gold from player")
-    print("3. Gift item to player")
-    print("4. Take item from player")
-    print("5. Configure rarity weights")
-    print("6. Manage shop")
-    print("7. Back to main menu")
+    print(_ADMIN_MENU)
+
+
+_CRAFTING_MENU = "\n".join([
+    "\n--- CRAFTING MENU ---",
+    "1. Add/Edit Recipe",
+    "2. Remove Recipe",
+    "3. View All Recipes",
+    "4. Edit Recipe",
+    "5. Back to main menu",
+])
 
 
 def show_crafting_menu():
-    print("\n--- CRAFTING MENU ---")
-    print("1. Add/Edit Recipe")
-    print("2. Remove Recipe")
-    print("3. View All Recipes")
-    print("4. Edit Recipe")
-    print("5. Back to main menu")
+    print(_CRAFTING_MENU)
+
+
+_ENCHANTMENT_MENU = "\n".join([
+    "\n--- ENCHANTMENT MENU ---",
+    "1. Add enchantment",
+    "2. Edit enchantment",
+    "3. Delete enchantment",
+    "4. Set global enchantment cost",
+    "5. View all enchantments",
+    "6. Enchant item (player)",
+    "7. Back to crafting menu",
+])
 
 
 def show_enchantment_menu():
-    print("\n--- ENCHANTMENT MENU ---")
-    print("1. Add enchantment")
-    print("2. Edit enchantment")
-    print("3. Delete enchantment")
-    print("4. Set global enchantment cost")
-    print("5. View all enchantments")
-    print("6. Enchant item (player)")
-    print("7. Back to crafting menu")
+    print(_ENCHANTMENT_MENU)
+
+
+_EQUIPMENT_MENU = "\n".join([
+    "\n--- EQUIPMENT & UPGRADES MENU ---",
+    "1. View player equipment & upgrades",
+    "2. Equip item",
+    "3. Unequip item",
+    "4. Consume upgrade",
+    "5. Back to main menu",
+])
 
 
 def show_equipment_menu():
-    print("\n--- EQUIPMENT & UPGRADES MENU ---")
-    print("1. View player equipment & upgrades")
-    print("2. Equip item")
-    print("3. Unequip item")
-    print("4. Consume upgrade")
-    print("5. Back to main menu")
+    print(_EQUIPMENT_MENU)
 
 
 def manage_equipment_upgrades(game):
     while True:
         show_equipment_menu()
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # View player equipment & upgrades
@@ -1326,7 +1801,7 @@ def manage_equipment_upgrades(game):
                 continue
 
             # Filter for Equipment items in inventory
-            equipment_items = [(i, item) for i, item in enumerate(player.inventory) if item.item_type.lower() == "equipment"]
+            equipment_items = [(i, item) for i, item in enumerate(player.inventory) if item.item_type_lower == "equipment"]
 
             if not equipment_items:
                 print(f"{player.name} has no equipment items to equip!")
@@ -1339,7 +1814,7 @@ def manage_equipment_upgrades(game):
                 print(f"  {idx}. {item.name} [{effects_str}]")
 
             try:
-                choice_idx = int(input("\nEnter item number to equip: ").strip())
+                choice_idx = int(read_input("\nEnter item number to equip: ").strip())
                 if 0 <= choice_idx < len(equipment_items):
                     inv_idx, item = equipment_items[choice_idx]
                     player.remove_item(inv_idx)
@@ -1373,7 +1848,7 @@ def manage_equipment_upgrades(game):
                 print(f"  {i}. {item.name} [{effects_str if effects_str else 'No effects'}]")
 
             try:
-                index = int(input("\nEnter item number to unequip: ").strip())
+                index = int(read_input("\nEnter item number to unequip: ").strip())
                 item = player.unequip_item(index)
                 if item:
                     player.add_item(item)
@@ -1396,7 +1871,7 @@ def manage_equipment_upgrades(game):
                 continue
 
             # Filter for Upgrade items in inventory
-            upgrade_items = [(i, item) for i, item in enumerate(player.inventory) if item.item_type.lower() == "upgrade"]
+            upgrade_items = [(i, item) for i, item in enumerate(player.inventory) if item.item_type_lower == "upgrade"]
 
             if not upgrade_items:
                 print(f"{player.name} has no upgrade items to consume!")
@@ -1409,7 +1884,7 @@ def manage_equipment_upgrades(game):
                 print(f"  {idx}. {item.name} [{effects_str}]")
 
             try:
-                choice_idx = int(input("\nEnter item number to consume: ").strip())
+                choice_idx = int(read_input("\nEnter item number to consume: ").strip())
                 if 0 <= choice_idx < len(upgrade_items):
                     inv_idx, item = upgrade_items[choice_idx]
                     player.remove_item(inv_idx)
@@ -1424,6 +1899,14 @@ def manage_equipment_upgrades(game):
             break
 
 
+_EFFECT_TYPES_HELP = "\n".join([
+    "\nAvailable effect types:",
+    "  1. double_next_draw - Doubles quantity on next draw (guaranteed)",
+    "  2. free_draw_ticket - Draw X items for free from selected table",
+    "  3. trash_to_treasure - Next draw excludes highest weight item",
+])
+
+
 def manage_consumables(game):
     """Manage consumable items with temporary effects."""
     while True:
@@ -1434,20 +1917,17 @@ def manage_consumables(game):
         print("4. View all consumables")
         print("5. Back to loot table menu")
 
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # Add consumable
-            name = input("Enter consumable name: ").strip()
+            name = read_input("Enter consumable name: ").strip()
             if not name:
                 print("Name cannot be empty!")
                 continue
 
-            print("\nAvailable effect types:")
-            print("  1. double_next_draw - Doubles quantity on next draw (guaranteed)")
-            print("  2. free_draw_ticket - Draw X items for free from selected table")
-            print("  3. trash_to_treasure - Next draw excludes highest weight item")
-            effect_choice = input("Choose effect type (1-3): ").strip()
+            print(_EFFECT_TYPES_HELP)
+            effect_choice = read_input("Choose effect type (1-3): ").strip()
 
             effect_type = None
             effect_value = None
@@ -1465,11 +1945,10 @@ def manage_consumables(game):
                     continue
 
                 print("\nAvailable loot tables:")
-                for i, table in enumerate(game.loot_tables):
-                    print(f"  {i}. {table.name}")
+                print("\n".join(f"  {i}. {table.name}" for i, table in enumerate(game.loot_tables)))
 
                 try:
-                    table_idx = int(input("Select table for this ticket: ").strip())
+                    table_idx = int(read_input("Select table for this ticket: ").strip())
                     if table_idx < 0 or table_idx >= len(game.loot_tables):
                         print("Invalid table number!")
                         continue
@@ -1479,7 +1958,7 @@ def manage_consumables(game):
                     continue
 
                 try:
-                    draws = int(input("Enter number of free draws: ").strip())
+                    draws = int(read_input("Enter number of free draws: ").strip())
                     if draws <= 0:
                         print("Number of draws must be greater than 0!")
                         continue
@@ -1495,13 +1974,14 @@ def manage_consumables(game):
                 continue
 
             try:
-                gold_value = int(input(f"Enter sell gold value: ").strip())
+                gold_value = int(read_input(f"Enter sell gold value: ").strip())
                 if gold_value < 0:
                     print("Value cannot be negative!")
                     continue
 
                 consumable = Consumable(name, effect_type, effect_value, gold_value, table_name)
                 game.consumables.append(consumable)
+                game.reindex_consumables()
                 print(f"✓ Added consumable: {consumable}")
             except ValueError:
                 print("Invalid input!")
@@ -1513,11 +1993,10 @@ def manage_consumables(game):
                 continue
 
             print("\nConsumables:")
-            for i, cons in enumerate(game.consumables):
-                print(f"  {i}. {cons}")
+            print("\n".join(f"  {i}. {cons}" for i, cons in enumerate(game.consumables)))
 
             try:
-                index = int(input("\nEnter consumable number to edit: ").strip())
+                index = int(read_input("\nEnter consumable number to edit: ").strip())
                 if index < 0 or index >= len(game.consumables):
                     print("Invalid consumable number!")
                     continue
@@ -1526,13 +2005,16 @@ def manage_consumables(game):
                 print(f"\nEditing: {cons.name}")
                 print("Leave blank to keep current value")
 
-                new_name = input(f"New name [{cons.name}]: ").strip()
-                new_gold = input(f"New sell value [{cons.gold_value}g]: ").strip()
+                new_name = read_input(f"New name [{cons.name}]: ").strip()
+                new_gold = read_input(f"New sell value [{cons.gold_value}g]: ").strip()
+
+                # Parse before changing anything, so a bad value leaves the consumable and its index as they were
+                gold_value = int(new_gold) if new_gold else cons.gold_value
 
                 if new_name:
                     cons.name = new_name
-                if new_gold:
-                    cons.gold_value = int(new_gold)
+                cons.gold_value = gold_value
+                game.reindex_consumables()
 
                 print(f"✓ Updated: {cons}")
             except ValueError:
@@ -1545,13 +2027,13 @@ def manage_consumables(game):
                 continue
 
             print("\nConsumables:")
-            for i, cons in enumerate(game.consumables):
-                print(f"  {i}. {cons}")
+            print("\n".join(f"  {i}. {cons}" for i, cons in enumerate(game.consumables)))
 
             try:
-                index = int(input("\nEnter consumable number to delete: ").strip())
+                index = int(read_input("\nEnter consumable number to delete: ").strip())
                 if 0 <= index < len(game.consumables):
                     deleted = game.consumables.pop(index)
+                    game.reindex_consumables()
                     print(f"✓ Deleted consumable: {deleted.name}")
                 else:
                     print("Invalid consumable number!")
@@ -1564,12 +2046,10 @@ def manage_consumables(game):
                 print("No consumables exist!")
                 continue
 
-            print(f"\n{'=' * 60}")
-            print("ALL CONSUMABLES")
-            print(f"{'=' * 60}")
-            for i, cons in enumerate(game.consumables):
-                print(f"{i}. {cons}")
-            print(f"{'=' * 60}")
+            lines = ["\n" + SEP, "ALL CONSUMABLES", SEP]
+            lines.extend(f"{i}. {cons}" for i, cons in enumerate(game.consumables))
+            lines.append(SEP)
+            print("\n".join(lines))
 
         elif choice == "5":
             break
@@ -1585,23 +2065,23 @@ def manage_loot_table(game):
             print("\n[No tables exist! Please create one]")
 
         show_loot_menu()
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # Select/Create loot table
             if game.loot_tables:
                 print("\nExisting tables:")
-                for i, table in enumerate(game.loot_tables):
-                    marker = " <--" if i == game.current_table_index else ""
-                    print(f"  {i}. {table.name} (Draw Cost: {table.draw_cost}g, Items: {len(table.items)}){marker}")
+                print("\n".join(f"  {i}. {table.name} (Draw Cost: {table.draw_cost}g, Items: {len(table.items)})"
+                                 f"{' <--' if i == game.current_table_index else ''}"
+                                 for i, table in enumerate(game.loot_tables)))
 
                 print("\nEnter table number to select, or 'new' to create new table")
-                selection = input("Choice: ").strip().lower()
+                selection = read_input("Choice: ").strip().lower()
 
                 if selection == 'new':
-                    name = input("Enter new table name: ").strip() or "Unnamed Table"
+                    name = read_input("Enter new table name: ").strip() or "Unnamed Table"
                     try:
-                        cost = int(input("Enter draw cost (default 100): ").strip() or "100")
+                        cost = int(read_input("Enter draw cost (default 100): ").strip() or "100")
                         game.add_loot_table(name, cost)
                         game.current_table_index = len(game.loot_tables) - 1
                         print(f"✓ Created and selected table '{name}'")
@@ -1619,9 +2099,9 @@ def manage_loot_table(game):
                         print("Invalid input!")
             else:
                 # No tables exist, create first one
-                name = input("Enter table name (default 'Default'): ").strip() or "Default"
+                name = read_input("Enter table name (default 'Default'): ").strip() or "Default"
                 try:
-                    cost = int(input("Enter draw cost (default 100): ").strip() or "100")
+                    cost = int(read_input("Enter draw cost (default 100): ").strip() or "100")
                     game.add_loot_table(name, cost)
                     game.current_table_index = 0
                     print(f"✓ Created table '{name}'")
@@ -1647,23 +2127,23 @@ def manage_loot_table(game):
                 print("\nChoose how to add item:")
                 print("1. From Master Items Registry")
                 print("2. Create custom item (not in registry)")
-                add_choice = input("Choice: ").strip()
+                add_choice = read_input("Choice: ").strip()
 
                 if add_choice == "1":
                     # Add from master items
                     print("\nMaster Items:")
-                    for i, master_item in enumerate(game.master_items):
-                        print(f"  {i}. {master_item.name} ({master_item.item_type}) - {master_item.gold_value_per_unit}g each")
+                    print("\n".join(f"  {i}. {master_item.name} ({master_item.item_type}) - {master_item.gold_value_per_unit}g each"
+                                     for i, master_item in enumerate(game.master_items)))
 
                     try:
-                        item_index = int(input("\nEnter item number: ").strip())
+                        item_index = int(read_input("\nEnter item number: ").strip())
                         if item_index < 0 or item_index >= len(game.master_items):
                             print("Invalid item number!")
                             continue
 
                         master_item = game.master_items[item_index]
-                        quantity = int(input("Enter quantity (default 1): ").strip() or "1")
-                        weight = float(input("Enter weight: ").strip())
+                        quantity = int(read_input("Enter quantity (default 1): ").strip() or "1")
+                        weight = float(read_input("Enter weight: ").strip())
 
                         if weight <= 0 or quantity < 1:
                             print("Invalid values!")
@@ -1671,6 +2151,8 @@ def manage_loot_table(game):
 
                         loot_item = master_item.create_loot_item(quantity, weight)
                         current_table.items.append(loot_item)
+                        current_table.invalidate_cache()
+                        game.invalidate_item_cache()
                         display_name = f"{quantity}x {master_item.name}" if quantity > 1 else master_item.name
                         print(f"✓ Added '{display_name}' to {current_table.name}")
                     except ValueError:
@@ -1681,22 +2163,23 @@ def manage_loot_table(game):
                     continue
 
             # Create custom item
-            name = input("Enter item name: ").strip()
+            name = read_input("Enter item name: ").strip()
             if not name:
                 print("Item name cannot be empty!")
                 continue
 
             try:
-                quantity = int(input("Enter quantity (default 1): ").strip() or "1")
-                weight = float(input("Enter weight: ").strip())
-                gold = int(input(f"Enter gold value: ").strip())
+                quantity = int(read_input("Enter quantity (default 1): ").strip() or "1")
+                weight = float(read_input("Enter weight: ").strip())
+                gold = int(read_input(f"Enter gold value: ").strip())
                 if weight <= 0 or gold < 0 or quantity < 1:
                     print("Invalid values!")
                     continue
 
-                item_type = input("Enter item type (e.g., weapon, armor, misc): ").strip() or "misc"
+                item_type = read_input("Enter item type (e.g., weapon, armor, misc): ").strip() or "misc"
 
                 current_table.add_item(name, weight, gold, item_type, quantity)
+                game.invalidate_item_cache()
                 display_name = f"{quantity}x {name}" if quantity > 1 else name
                 print(f"✓ Added '{display_name}' to {current_table.name}")
             except ValueError:
@@ -1709,11 +2192,11 @@ def manage_loot_table(game):
                 continue
 
             print("\nCurrent items:")
-            for i, item in enumerate(current_table.items):
-                print(f"  {i}. {item.get_display_name()} (weight: {item.weight}, value: {item.gold_value}g, type: {item.item_type})")
+            print("\n".join(f"  {i}. {item.get_display_name()} (weight: {item.weight}, value: {item.gold_value}g, type: {item.item_type})"
+                             for i, item in enumerate(current_table.items)))
 
             try:
-                index = int(input("\nEnter item number to edit: ").strip())
+                index = int(read_input("\nEnter item number to edit: ").strip())
                 if index < 0 or index >= len(current_table.items):
                     print("Invalid item number!")
                     continue
@@ -1722,11 +2205,11 @@ def manage_loot_table(game):
                 print(f"\nEditing: {item.get_display_name()}")
                 print("Leave blank to keep current value")
 
-                new_name = input(f"New name [{item.name}]: ").strip()
-                quantity_input = input(f"New quantity [{item.quantity}]: ").strip()
-                weight_input = input(f"New weight [{item.weight}]: ").strip()
-                gold_input = input(f"New gold value [{item.gold_value}]: ").strip()
-                type_input = input(f"New type [{item.item_type}]: ").strip()
+                new_name = read_input(f"New name [{item.name}]: ").strip()
+                quantity_input = read_input(f"New quantity [{item.quantity}]: ").strip()
+                weight_input = read_input(f"New weight [{item.weight}]: ").strip()
+                gold_input = read_input(f"New gold value [{item.gold_value}]: ").strip()
+                type_input = read_input(f"New type [{item.item_type}]: ").strip()
 
                 new_quantity = int(quantity_input) if quantity_input else None
                 new_weight = float(weight_input) if weight_input else None
@@ -1734,6 +2217,7 @@ def manage_loot_table(game):
                 new_type = type_input if type_input else None
 
                 current_table.edit_item(index, new_name if new_name else None, new_weight, new_gold, new_type, new_quantity)
+                game.invalidate_item_cache()
                 print(f"✓ Updated item!")
             except ValueError:
                 print("Invalid input!")
@@ -1745,17 +2229,18 @@ def manage_loot_table(game):
                 continue
 
             print("\nCurrent items:")
-            for i, item in enumerate(current_table.items):
-                print(f"  {i}. {item.get_display_name()} (weight: {item.weight}, value: {item.gold_value}g, type: {item.item_type})")
+            print("\n".join(f"  {i}. {item.get_display_name()} (weight: {item.weight}, value: {item.gold_value}g, type: {item.item_type})"
+                             for i, item in enumerate(current_table.items)))
 
             try:
-                index = int(input("\nEnter item number to delete: ").strip())
+                index = int(read_input("\nEnter item number to delete: ").strip())
                 if index < 0 or index >= len(current_table.items):
                     print("Invalid item number!")
                     continue
 
                 item_display_name = current_table.items[index].get_display_name()
                 current_table.remove_item(index)
+                game.invalidate_item_cache()
                 print(f"✓ Deleted '{item_display_name}'")
             except ValueError:
                 print("Invalid input!")
@@ -1769,11 +2254,12 @@ def manage_loot_table(game):
             print(f"\nEditing table: {current_table.name}")
             print("Leave blank to keep current value")
 
-            new_name = input(f"New name [{current_table.name}]: ").strip()
-            cost_input = input(f"New draw cost [{current_table.draw_cost}]: ").strip()
+            new_name = read_input(f"New name [{current_table.name}]: ").strip()
+            cost_input = read_input(f"New draw cost [{current_table.draw_cost}]: ").strip()
 
             if new_name:
                 current_table.name = new_name
+                game.reindex_loot_tables()
             if cost_input:
                 try:
                     current_table.draw_cost = int(cost_input)
@@ -1792,10 +2278,12 @@ def manage_loot_table(game):
                 print("Cannot delete the last table!")
                 continue
 
-            confirm = input(f"Delete table '{current_table.name}'? (y/n): ").strip().lower()
+            confirm = read_input(f"Delete table '{current_table.name}'? (y/n): ").strip().lower()
             if confirm == 'y':
                 deleted_name = current_table.name
                 game.loot_tables.pop(game.current_table_index)
+                game.reindex_loot_tables()
+                game.invalidate_item_cache()
                 game.current_table_index = min(game.current_table_index, len(game.loot_tables) - 1)
                 print(f"✓ Deleted table '{deleted_name}'")
 
@@ -1806,10 +2294,9 @@ def manage_loot_table(game):
                 continue
 
             print(f"\n{current_table.name} (Admin View):")
-            total_weight = sum(item.weight for item in current_table.items)
-            for item in current_table.items:
-                percentage = (item.weight / total_weight) * 100
-                print(f"  - {item.get_display_name()}: weight {item.weight} ({percentage:.2f}%), value {item.gold_value}g")
+            rates = current_table.get_drop_rates()
+            print("\n".join(f"  - {item.get_display_name()}: weight {item.weight} ({rates[id(item)]}%), "
+                             f"value {item.gold_value}g" for item in current_table.items))
 
         elif choice == "10":
             # View rates for players
@@ -1821,17 +2308,13 @@ def manage_loot_table(game):
             print(f"{current_table.name.upper()} - RATES")
             print(f"Draw Cost: {current_table.draw_cost}g")
             print("=" * 50)
-            total_weight = sum(item.weight for item in current_table.items)
-
-            sorted_items = sorted(current_table.items, key=lambda x: x.weight)
+            rates = current_table.get_drop_rates()
+            sorted_items = current_table.get_items_by_weight()
 
-            for item in sorted_items:
-                percentage = (item.weight / total_weight) * 100
-                print(f"  {item.get_display_name()}")
-                print(f"    Type: {item.item_type}")
-                print(f"    Drop Rate: {percentage:.2f}%")
-                print(f"    Value: {item.gold_value}g")
-                print()
+            print("".join(f"  {item.get_display_name()}\n"
+                          f"    Type: {item.item_type}\n"
+                          f"    Drop Rate: {rates[id(item)]}%\n"
+                          f"    Value: {item.gold_value}g\n\n" for item in sorted_items), end="")
 
         elif choice == "11":
             # View all tables
@@ -1840,9 +2323,9 @@ def manage_loot_table(game):
                 continue
 
             print("\nAll Loot Tables:")
-            for i, table in enumerate(game.loot_tables):
-                marker = " <-- CURRENT" if i == game.current_table_index else ""
-                print(f"  {i}. {table.name} (Draw Cost: {table.draw_cost}g, Items: {len(table.items)}){marker}")
+            print("\n".join(f"  {i}. {table.name} (Draw Cost: {table.draw_cost}g, Items: {len(table.items)})"
+                             f"{' <-- CURRENT' if i == game.current_table_index else ''}"
+                             for i, table in enumerate(game.loot_tables)))
 
         elif choice == "12":
             break
@@ -1851,10 +2334,10 @@ def manage_loot_table(game):
 def manage_players(game):
     while True:
         show_player_menu()
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
-            name = input("Enter player name: ").strip()
+            name = read_input("Enter player name: ").strip()
             if not name:
                 print("Name cannot be empty!")
                 continue
@@ -1869,7 +2352,7 @@ def manage_players(game):
                 print("No players exist!")
                 continue
 
-            name = input("Enter player name to remove: ").strip()
+            name = read_input("Enter player name to remove: ").strip()
             if game.remove_player(name):
                 print(f"✓ Removed player '{name}'")
             else:
@@ -1880,14 +2363,13 @@ def manage_players(game):
                 print("No players exist!")
                 continue
 
-            name = input("Enter player name: ").strip()
+            name = read_input("Enter player name: ").strip()
             player = game.get_player(name)
             if player:
                 print(f"\n--- {player.name} ---")
                 print(f"Gold: {player.gold}g")
-                print(f"Inventory ({len(player.inventory)} items):")
-                for i, item in enumerate(player.inventory):
-                    print(f"  {i}. {item}")
+                print("\n".join([f"Inventory ({len(player.inventory)} items):",
+                                 *(f"  {i}. {item}" for i, item in enumerate(player.inventory))]))
             else:
                 print(f"Player '{name}' not found!")
 
@@ -1897,9 +2379,9 @@ def manage_players(game):
                 continue
 
             print("\nAll Players:")
-            for name, player in game.players.items():
-                current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-                print(f"  - {name}: {player.gold}g, {len(player.inventory)} items{current_marker}")
+            print("\n".join(f"  - {name}: {player.gold}g, {len(player.inventory)} items"
+                             f"{' <-- CURRENT' if name == game.current_player_name else ''}"
+                             for name, player in game.players.items()))
 
         elif choice == "5":
             # Set current player
@@ -1907,12 +2389,9 @@ def manage_players(game):
                 print("No players exist!")
                 continue
 
-            print("\nAvailable players:")
-            for name, player in game.players.items():
-                current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-                print(f"  - {name}{current_marker}")
+            show_available_players(game)
 
-            player_name = input("\nEnter player name to set as current (or 'none' to clear): ").strip()
+            player_name = read_input("\nEnter player name to set as current (or 'none' to clear): ").strip()
 
             if player_name.lower() == 'none':
                 game.current_player_name = None
@@ -1929,10 +2408,7 @@ def manage_players(game):
                 print("No players exist!")
                 continue
 
-            print("\nAvailable players:")
-            for name, player in game.players.items():
-                current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-                print(f"  - {name}{current_marker}")
+            show_available_players(game)
 
             player_name = get_player_name_input(game)
             player = game.get_player(player_name)
@@ -1942,18 +2418,17 @@ def manage_players(game):
                 continue
 
             # Find consumables in inventory
-            consumable_items = [(i, item) for i, item in enumerate(player.inventory) if item.item_type == "consumable"]
+            consumable_items = player.get_consumable_items()
 
             if not consumable_items:
                 print(f"{player.name} has no consumables!")
                 continue
 
             print(f"\n{player.name}'s Consumables:")
-            for idx, (inv_idx, item) in enumerate(consumable_items):
-                print(f"  {idx}. {item}")
+            print("\n".join(f"  {idx}. {item}" for idx, (inv_idx, item) in enumerate(consumable_items)))
 
             try:
-                choice_idx = int(input("\nEnter consumable number to use: ").strip())
+                choice_idx = int(read_input("\nEnter consumable number to use: ").strip())
                 if choice_idx < 0 or choice_idx >= len(consumable_items):
                     print("Invalid consumable number!")
                     continue
@@ -1961,11 +2436,7 @@ def manage_players(game):
                 inv_idx, consumable_item = consumable_items[choice_idx]
 
                 # Find the consumable definition
-                matching_consumable = None
-                for cons in game.consumables:
-                    if cons.name == consumable_item.name:
-                        matching_consumable = cons
-                        break
+                matching_consumable = game.get_consumable(consumable_item.name)
 
                 if not matching_consumable:
                     print(f"Warning: Consumable '{consumable_item.name}' not found in definitions! Using as-is.")
@@ -1985,8 +2456,7 @@ def manage_players(game):
                         continue
 
                     # Check if table still exists
-                    table_exists = any(t.name == table_name for t in game.loot_tables)
-                    if not table_exists:
+                    if game.get_loot_table(table_name) is None:
                         print(f"❌ Table '{table_name}' no longer exists! Cannot use ticket.")
                         continue
 
@@ -2015,11 +2485,9 @@ def manage_players(game):
                     print("   Effect: Next draw will exclude the highest weight item!")
 
                 print(f"\nActive effects: {len(player.active_consumable_effects)}")
-                for eff in player.active_consumable_effects:
-                    if eff['effect_type'] == 'free_draw_ticket':
-                        print(f"  - {eff['name']} ({eff['draws']} draw(s) from {eff['table_name']})")
-                    else:
-                        print(f"  - {eff['name']} ({eff['effect_type']})")
+                print("\n".join(f"  - {eff['name']} ({eff['draws']} draw(s) from {eff['table_name']})"
+                                 if eff['effect_type'] == 'free_draw_ticket' else f"  - {eff['name']} ({eff['effect_type']})"
+                                 for eff in player.active_consumable_effects))
 
             except ValueError:
                 print("Invalid input!")
@@ -2028,7 +2496,101 @@ def manage_players(game):
             break
 
 
+# Result-line suffixes for a drawn item, keyed by (doubled by chance, price boosted)
+_DRAW_TAGS = {
+    (False, False): "",
+    (True, False): " ✨ DOUBLED!",
+    (False, True): " 💰 PRICE BOOST!",
+    (True, True): " ✨ DOUBLED! 💰 PRICE BOOST!",
+}
+# Suffixes for items doubled by Double Next Draw, keyed by price boosted
+_CONSUMABLE_DOUBLED_TAGS = {
+    False: " 🔥 CONSUMABLE DOUBLED!",
+    True: " 🔥 CONSUMABLE DOUBLED! 💰 PRICE BOOST!",
+}
+
+
+def _roll_missing_rarities(items, rarity_system):
+    """Give every drawn equipment item that lacks a rarity one, rolled as a single batch."""
+    pending = [item for item in items if item.item_type_lower == "equipment" and not item.rarity]
+    if pending:
+        for item, rarity in zip(pending, rarity_system.roll_rarities(len(pending))):
+            item.rarity = rarity
+
+
+def _roll_doubles(count, double_chance):
+    """Roll the double-quantity chance for a whole batch of draws; returns one flag per draw."""
+    if double_chance <= 0:
+        return [False] * count
+    return [_random() * 100 < double_chance for _ in range(count)]
+
+
+def _add_drawn_items(player, items, rarity_system, double_chance, flat_price, percent_price,
+                     force_double=False):
+    """Apply draw modifiers to drawn items, print them and add them to the player's inventory.
+
+    Returns (total_value, doubled_count, price_boosted_count, consumable_doubled_count).
+    """
+    apply_price_boost = flat_price > 0 or percent_price > 0
+    total_value = 0
+    doubled_count = 0
+    price_boosted_count = 0
+    consumable_doubled_count = 0
+    lines = []
+    _roll_missing_rarities(items, rarity_system)
+
+    if not force_double and double_chance <= 0 and not apply_price_boost:
+        # Nothing to double or boost, so skip the per-item modifier checks
+        for i, item in enumerate(items, 1):
+            lines.append(f"  {i}. {item}")
+            player.add_item(item)
+            total_value += item.gold_value
+    else:
+        price_multiplier = 1 + percent_price / 100  # Same math as Player.calculate_item_value
+        # A forced double covers everything, so chance rolls are only needed without it
+        doubles = _roll_doubles(len(items), 0 if force_double else double_chance)
+
+        for i, (item, doubled) in enumerate(zip(items, doubles), 1):
+            # Apply sell price increase
+            price_boosted = False
+            if apply_price_boost:
+                original_value = item.gold_value
+                item.gold_value = int(original_value * price_multiplier + flat_price)
+                if item.gold_value > original_value:
+                    price_boosted_count += 1
+                    price_boosted = True
+
+            # Apply doubling, consumable first, otherwise the chance rolled above
+            if force_double:
+                item.quantity *= 2
+                item.gold_value *= 2
+                consumable_doubled_count += 1
+                tags = _CONSUMABLE_DOUBLED_TAGS[price_boosted]
+            else:
+                if doubled:
+                    item.quantity *= 2
+                    item.gold_value *= 2
+                    doubled_count += 1
+                tags = _DRAW_TAGS[doubled, price_boosted]
+
+            # Display item with indicators
+            lines.append(f"  {i}. {item}{tags}")
+
+            player.add_item(item)
+            total_value += item.gold_value
+
+    if lines:
+        print("\n".join(lines))
+    return total_value, doubled_count, price_boosted_count, consumable_doubled_count
+
+
 def draw_items_menu(game):
+    """Process free draw tickets, then draw from a table for one player."""
+    with buffered_output():
+        _run_draw_items(game)
+
+
+def _run_draw_items(game):
     if not game.loot_tables:
         print("No loot tables exist! Create one first.")
         return
@@ -2039,22 +2601,24 @@ def draw_items_menu(game):
 
     # Check for and process free draw tickets first
     for player_name, player in game.players.items():
-        ticket_effects = [eff for eff in player.active_consumable_effects if eff['effect_type'] == 'free_draw_ticket']
+        ticket_effects = []
+        other_effects = []
+        for eff in player.active_consumable_effects:
+            (ticket_effects if eff['effect_type'] == 'free_draw_ticket' else other_effects).append(eff)
+        if not ticket_effects:
+            continue
+        # Every ticket is used up below, whether it draws or not
+        player.active_consumable_effects = other_effects
 
         for ticket_effect in ticket_effects:
             table_name = ticket_effect.get('table_name')
             draws = ticket_effect.get('draws', 1)
 
             # Find the table
-            selected_table = None
-            for table in game.loot_tables:
-                if table.name == table_name:
-                    selected_table = table
-                    break
+            selected_table = game.get_loot_table(table_name)
 
             if not selected_table or not selected_table.items:
                 print(f"\n⚠️  {player_name}'s ticket for '{table_name}' cannot be used (table not found or empty)!")
-                player.active_consumable_effects.remove(ticket_effect)
                 continue
 
             print(f"\n🎟️  {player_name} is using a FREE DRAW TICKET!")
@@ -2066,47 +2630,8 @@ def draw_items_menu(game):
             double_chance = player.get_double_quantity_chance()
             flat_price, percent_price = player.get_sell_price_increase()
 
-            doubled_count = 0
-            price_boosted_count = 0
-
-            for i, item in enumerate(items, 1):
-                # Roll rarity for Equipment items
-                if item.item_type.lower() == "equipment" and not item.rarity:
-                    item.rarity = game.rarity_system.roll_rarity()
-
-                # Apply sell price increase
-                price_boosted = False
-                if flat_price > 0 or percent_price > 0:
-                    original_value = item.gold_value
-                    item.gold_value = player.calculate_item_value(original_value, is_crafted=False)
-                    if item.gold_value > original_value:
-                        price_boosted_count += 1
-                        price_boosted = True
-
-                # Check for doubling
-                doubled = False
-                if double_chance > 0 and random.random() * 100 < double_chance:
-                    item.quantity *= 2
-                    item.gold_value *= 2
-                    doubled_count += 1
-                    doubled = True
-
-                # Display with indicators
-                indicators = []
-                if doubled:
-                    indicators.append("✨ DOUBLED!")
-                if price_boosted:
-                    indicators.append("💰 PRICE BOOST!")
-
-                if indicators:
-                    print(f"  {i}. {item} {' '.join(indicators)}")
-                else:
-                    print(f"  {i}. {item}")
-
-                player.add_item(item)
-
-            # Remove ticket after use
-            player.active_consumable_effects.remove(ticket_effect)
+            _, doubled_count, price_boosted_count, _ = _add_drawn_items(
+                player, items, game.rarity_system, double_chance, flat_price, percent_price)
             print(f"🎟️  Ticket used! {draws} free item(s) received.")
 
             if doubled_count > 0:
@@ -2116,11 +2641,11 @@ def draw_items_menu(game):
 
     # Select table
     print("\nAvailable loot tables:")
-    for i, table in enumerate(game.loot_tables):
-        print(f"  {i}. {table.name} (Cost: {table.draw_cost}g per draw, Items: {len(table.items)})")
+    print("\n".join(f"  {i}. {table.name} (Cost: {table.draw_cost}g per draw, Items: {len(table.items)})"
+                     for i, table in enumerate(game.loot_tables)))
 
     try:
-        table_index = int(input("\nSelect table number: ").strip())
+        table_index = int(read_input("\nSelect table number: ").strip())
         if table_index < 0 or table_index >= len(game.loot_tables):
             print("Invalid table number!")
             return
@@ -2131,10 +2656,7 @@ def draw_items_menu(game):
             print(f"Table '{selected_table.name}' has no items!")
             return
 
-        print("\nAvailable players:")
-        for name, player in game.players.items():
-            current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-            print(f"  - {name} ({player.gold}g){current_marker}")
+        show_available_players(game, show_gold=True)
 
         player_name = get_player_name_input(game)
         player = game.get_player(player_name)
@@ -2152,7 +2674,7 @@ def draw_items_menu(game):
         if flat > 0 or percent > 0:
             reduction_info = f" (Base: {base_cost}g, -{flat} flat, -{percent}%)"
 
-        count = int(input(f"How many items to draw? (Cost: {actual_cost}g per draw{reduction_info}): ").strip())
+        count = int(read_input(f"How many items to draw? (Cost: {actual_cost}g per draw{reduction_info}): ").strip())
         if count <= 0:
             print("Count must be greater than 0!")
             return
@@ -2166,28 +2688,18 @@ def draw_items_menu(game):
         player.remove_gold(total_cost)
 
         # Check for active consumable effects before drawing
-        has_double_next_draw = False
-        has_trash_to_treasure = False
-        for effect in player.active_consumable_effects:
-            if effect['effect_type'] == 'double_next_draw':
-                has_double_next_draw = True
-            elif effect['effect_type'] == 'trash_to_treasure':
-                has_trash_to_treasure = True
+        active_types = {effect['effect_type'] for effect in player.active_consumable_effects}
+        has_double_next_draw = 'double_next_draw' in active_types
+        has_trash_to_treasure = 'trash_to_treasure' in active_types
 
         # Apply trash_to_treasure: temporarily exclude highest weight item
         excluded_item = None
         if has_trash_to_treasure and selected_table.items:
             # Find item with highest weight (lowest value item since high weight = common)
-            highest_weight_item = max(selected_table.items, key=lambda x: x.weight)
-            excluded_item = highest_weight_item
-            selected_table.items.remove(excluded_item)
+            excluded_item = selected_table.get_heaviest_item()
             print(f"🎯 TRASH TO TREASURE ACTIVE: '{excluded_item.name}' (highest weight) excluded from this draw!")
 
-        items = selected_table.draw_multiple(count)
-
-        # Restore excluded item
-        if excluded_item:
-            selected_table.items.append(excluded_item)
+        items = selected_table.draw_multiple(count, exclude=excluded_item)
 
         print(f"\n💰 Paid {total_cost}g ({count} x {actual_cost}g) to {selected_table.name}")
         print(f"🎲 {player.name} drew {count} items:")
@@ -2201,66 +2713,20 @@ def draw_items_menu(game):
         # Get sell price increase for non-crafted items
         flat_price, percent_price = player.get_sell_price_increase()
 
-        total_value = 0
-        doubled_count = 0
-        price_boosted_count = 0
-        consumable_doubled_count = 0
-
-        for i, item in enumerate(items, 1):
-            # Roll rarity for Equipment items
-            if item.item_type.lower() == "equipment" and not item.rarity:
-                item.rarity = game.rarity_system.roll_rarity()
-
-            # Apply sell price increase to non-crafted items
-            price_boosted = False
-            if flat_price > 0 or percent_price > 0:
-                original_value = item.gold_value
-                item.gold_value = player.calculate_item_value(original_value, is_crafted=False)
-                if item.gold_value > original_value:
-                    price_boosted_count += 1
-                    price_boosted = True
-
-            # Check if we should double the quantity
-            doubled = False
-            consumable_doubled = False
-
-            # Apply consumable effect (guaranteed double)
-            if has_double_next_draw:
-                item.quantity *= 2
-                item.gold_value *= 2
-                consumable_doubled_count += 1
-                consumable_doubled = True
-            # Otherwise check for chance-based double
-            elif double_chance > 0 and random.random() * 100 < double_chance:
-                item.quantity *= 2
-                item.gold_value *= 2
-                doubled_count += 1
-                doubled = True
-
-            # Display item with indicators
-            indicators = []
-            if consumable_doubled:
-                indicators.append("🔥 CONSUMABLE DOUBLED!")
-            elif doubled:
-                indicators.append("✨ DOUBLED!")
-            if price_boosted:
-                indicators.append("💰 PRICE BOOST!")
-
-            if indicators:
-                print(f"  {i}. {item} {' '.join(indicators)}")
-            else:
-                print(f"  {i}. {item}")
+        total_value, doubled_count, price_boosted_count, consumable_doubled_count = _add_drawn_items(
+            player, items, game.rarity_system, double_chance, flat_price, percent_price,
+            force_double=has_double_next_draw)
 
-            player.add_item(item)
-            total_value += item.gold_value
+        # Remove consumable effects after use, both kinds in one pass
+        if has_double_next_draw or has_trash_to_treasure:
+            used_types = active_types & {'double_next_draw', 'trash_to_treasure'}
+            player.active_consumable_effects = [eff for eff in player.active_consumable_effects
+                                                if eff['effect_type'] not in used_types]
 
-        # Remove consumable effects after use
         if has_double_next_draw:
-            player.active_consumable_effects = [eff for eff in player.active_consumable_effects if eff['effect_type'] != 'double_next_draw']
             print(f"\n🔥 Consumable effect used! {consumable_doubled_count} item(s) DOUBLED from consumable!")
 
         if has_trash_to_treasure:
-            player.active_consumable_effects = [eff for eff in player.active_consumable_effects if eff['effect_type'] != 'trash_to_treasure']
             print(f"🎯 Trash to Treasure effect used! Highest weight item was excluded.")
 
         if doubled_count > 0:
@@ -2282,10 +2748,7 @@ def sell_items_menu(game):
         print("No players exist! Add players first.")
         return
 
-    print("\nAvailable players:")
-    for name, player in game.players.items():
-        current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-        print(f"  - {name} ({player.gold}g, {len(player.inventory)} items){current_marker}")
+    show_available_players(game, show_gold=True, show_items=True)
 
     player_name = get_player_name_input(game)
     player = game.get_player(player_name)
@@ -2306,7 +2769,7 @@ def sell_items_menu(game):
             print(f"  {i}. {item}")
 
         print("\nEnter item number to sell (or 'back' to return)")
-        choice = input("Choice: ").strip().lower()
+        choice = read_input("Choice: ").strip().lower()
 
         if choice == 'back':
             break
@@ -2338,15 +2801,12 @@ def shop_menu(game):
         return
 
     # Check if there are any items in the shop
-    shop_items = [item for item in game.master_items if item.purchase_price is not None]
+    shop_items = game.get_shop_items()
     if not shop_items:
         print("The shop is empty! Add items to the shop first (Admin Menu > Manage Shop).")
         return
 
-    print("\nAvailable players:")
-    for name, player in game.players.items():
-        current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-        print(f"  - {name} ({player.gold}g){current_marker}")
+    show_available_players(game, show_gold=True)
 
     player_name = get_player_name_input(game)
     player = game.get_player(player_name)
@@ -2356,19 +2816,19 @@ def shop_menu(game):
         return
 
     while True:
-        print(f"\n{'=' * 60}")
+        print("\n" + SEP)
         print("SHOP")
-        print(f"{'=' * 60}")
+        print(SEP)
         print(f"{player.name}'s gold: {player.gold}g")
         print()
 
         # Get items available for purchase (master items with purchase_price set)
-        shop_items = [item for item in game.master_items if item.purchase_price is not None]
+        shop_items = game.get_shop_items()
 
         if not shop_items:
             print("No items available in shop!")
             print("(Use the admin menu to add items to the shop)")
-            input("\nPress Enter to return...")
+            read_input("\nPress Enter to return...")
             break
 
         # Display shop items
@@ -2376,7 +2836,7 @@ def shop_menu(game):
         for i, item in enumerate(shop_items):
             print(f"  {i}. {item.name} ({item.item_type}) - Buy: {item.purchase_price}g, Sells for: {item.gold_value_per_unit}g")
 
-        choice = input("\nEnter item number to buy (or 'back' to return): ").strip().lower()
+        choice = read_input("\nEnter item number to buy (or 'back' to return): ").strip().lower()
 
         if choice == 'back':
             break
@@ -2390,7 +2850,7 @@ def shop_menu(game):
             master_item = shop_items[index]
 
             # Get quantity
-            quantity = int(input("How many to buy? ").strip())
+            quantity = int(read_input("How many to buy? ").strip())
             if quantity <= 0:
                 print("Quantity must be at least 1!")
                 continue
@@ -2411,7 +2871,7 @@ def shop_menu(game):
                 loot_item = LootItem(master_item.name, 1000, master_item.gold_value_per_unit, master_item.item_type, 1)
 
                 # Roll rarity for Equipment items
-                if master_item.item_type.lower() == "equipment":
+                if master_item.item_type_lower == "equipment":
                     loot_item.rarity = game.rarity_system.roll_rarity()
 
                 player.add_item(loot_item)
@@ -2423,8 +2883,41 @@ def shop_menu(game):
             print("Invalid input!")
 
 
+@contextmanager
+def buffered_output():
+    """Collect printed output and write it out in batches when not attached to a terminal.
+
+    Yields a flush function. When stdin or stdout is a terminal, output is left
+    unbuffered so prompts and responses stay interleaved, and flush is a no-op.
+    """
+    if sys.stdin.isatty() or sys.stdout.isatty():
+        yield lambda: None
+        return
+
+    real_stdout = sys.stdout
+    buffer = io.StringIO()
+
+    def flush():
+        real_stdout.write(buffer.getvalue())
+        real_stdout.flush()
+        buffer.seek(0)
+        buffer.truncate()
+
+    sys.stdout = buffer
+    try:
+        yield flush
+    finally:
+        sys.stdout = real_stdout
+        flush()
+
+
 def quick_turn_menu(game):
     """Execute a quick turn: draw, show results, craft, sell for all players."""
+    with buffered_output() as flush_output:
+        _run_quick_turn(game, flush_output)
+
+
+def _run_quick_turn(game, flush_output):
     if not game.loot_tables:
         print("No loot tables exist! Create one first.")
         return
@@ -2433,26 +2926,26 @@ def quick_turn_menu(game):
         print("No players exist! Add players first.")
         return
 
-    print("\n" + "=" * 60)
+    # Snapshot player order once so every phase visits players consistently
+    players = list(game.players.items())
+
+    print("\n" + SEP)
     print("QUICK TURN MODE")
-    print("=" * 60)
+    print(SEP)
 
     # Phase 1: Draw phase
     print("\n📦 PHASE 1: DRAWING")
     print("-" * 60)
 
     # Get number of draws per player
-    try:
-        draws_per_player = int(input("How many draws per player? ").strip())
-        if draws_per_player <= 0:
-            print("Number of draws must be greater than 0!")
-            return
-    except ValueError:
-        print("Invalid input!")
+    draws_per_player = prompt_int("How many draws per player? ", lo=1,
+                                  range_error="Number of draws must be greater than 0!")
+    if draws_per_player is None:
         return
 
     # Iterate through all players for drawing
-    for player_name, player in game.players.items():
+    drew_this_turn = set()  # Players whose inventory changed in Phase 1
+    for player_name, player in players:
         print(f"\n--- {player_name}'s Turn to Draw ---")
         print(f"Gold: {player.gold}g")
 
@@ -2461,112 +2954,80 @@ def quick_turn_menu(game):
         for i, table in enumerate(game.loot_tables):
             print(f"  {i}. {table.name} (Cost: {table.draw_cost}g per draw, Items: {len(table.items)})")
 
-        try:
-            table_index = int(input(f"\n{player_name}, select table number: ").strip())
-            if table_index < 0 or table_index >= len(game.loot_tables):
-                print("Invalid table number! Skipping this player.")
-                continue
-
-            selected_table = game.loot_tables[table_index]
-
-            if not selected_table.items:
-                print(f"Table '{selected_table.name}' has no items! Skipping this player.")
-                continue
+        table_index = prompt_int(f"\n{player_name}, select table number: ", lo=0, hi=len(game.loot_tables) - 1,
+                                 error="Invalid input! Skipping this player.",
+                                 range_error="Invalid table number! Skipping this player.")
+        if table_index is None:
+            continue
 
-            # Calculate actual draw cost with reductions
-            base_cost = selected_table.draw_cost
-            actual_cost = player.calculate_draw_cost(base_cost)
-            total_cost = draws_per_player * actual_cost
+        selected_table = game.loot_tables[table_index]
 
-            # Check if player has enough currency
-            if player.gold < total_cost:
-                print(f"❌ Not enough gold! Need {total_cost}g but {player.name} only has {player.gold}g")
-                print("Skipping this player.")
-                continue
+        if not selected_table.items:
+            print(f"Table '{selected_table.name}' has no items! Skipping this player.")
+            continue
 
-            # Deduct cost
-            player.remove_gold(total_cost)
+        # Calculate actual draw cost with reductions
+        base_cost = selected_table.draw_cost
+        actual_cost = player.calculate_draw_cost(base_cost)
+        total_cost = draws_per_player * actual_cost
 
-            # Draw items
-            items = selected_table.draw_multiple(draws_per_player)
-            print(f"\n💰 Paid {total_cost}g ({draws_per_player} x {actual_cost}g) to {selected_table.name}")
-            print(f"🎲 {player.name} drew {draws_per_player} items:")
+        # Check if player has enough currency
+        if player.gold < total_cost:
+            print(f"❌ Not enough gold! Need {total_cost}g but {player.name} only has {player.gold}g")
+            print("Skipping this player.")
+            continue
 
-            # Get double quantity chance
-            double_chance = player.get_double_quantity_chance()
+        # Deduct cost
+        player.remove_gold(total_cost)
 
-            # Get sell price increase for non-crafted items
-            flat_price, percent_price = player.get_sell_price_increase()
+        # Draw items
+        items = selected_table.draw_multiple(draws_per_player)
+        drew_this_turn.add(player_name)
+        print(f"\n💰 Paid {total_cost}g ({draws_per_player} x {actual_cost}g) to {selected_table.name}")
+        print(f"🎲 {player.name} drew {draws_per_player} items:")
 
-            total_value = 0
-            doubled_count = 0
-            price_boosted_count = 0
+        # Get double quantity chance
+        double_chance = player.get_double_quantity_chance()
 
-            for i, item in enumerate(items, 1):
-                # Roll rarity for Equipment items
-                if item.item_type.lower() == "equipment" and not item.rarity:
-                    item.rarity = game.rarity_system.roll_rarity()
-
-                # Apply sell price increase to non-crafted items
-                price_boosted = False
-                if flat_price > 0 or percent_price > 0:
-                    original_value = item.gold_value
-                    item.gold_value = player.calculate_item_value(original_value, is_crafted=False)
-                    if item.gold_value > original_value:
-                        price_boosted_count += 1
-                        price_boosted = True
-
-                # Check if we should double the quantity
-                doubled = False
-                if double_chance > 0 and random.random() * 100 < double_chance:
-                    item.quantity *= 2
-                    item.gold_value *= 2
-                    doubled_count += 1
-                    doubled = True
+        # Get sell price increase for non-crafted items
+        flat_price, percent_price = player.get_sell_price_increase()
 
-                # Display item with indicators
-                indicators = []
-                if doubled:
-                    indicators.append("✨ DOUBLED!")
-                if price_boosted:
-                    indicators.append("💰 PRICE BOOST!")
+        total_value, doubled_count, price_boosted_count, _ = _add_drawn_items(
+            player, items, game.rarity_system, double_chance, flat_price, percent_price)
 
-                if indicators:
-                    print(f"  {i}. {item} {' '.join(indicators)}")
-                else:
-                    print(f"  {i}. {item}")
+        if doubled_count > 0:
+            print(f"\n✨ {doubled_count} item(s) had their quantity doubled! (Chance: {double_chance}%)")
 
-                player.add_item(item)
-                total_value += item.gold_value
+        if price_boosted_count > 0:
+            print(f"💰 {price_boosted_count} item(s) had their value increased! (+{flat_price} flat, +{percent_price}%)")
 
-            if doubled_count > 0:
-                print(f"\n✨ {doubled_count} item(s) had their quantity doubled! (Chance: {double_chance}%)")
+        net_value = total_value - total_cost
+        print(f"\nTotal value: {total_value}g")
+        print(f"Net gain/loss: {net_value:+d}g")
+        print(f"{player.name}'s gold: {player.gold}g | Inventory: {len(player.inventory)} items")
 
-            if price_boosted_count > 0:
-                print(f"💰 {price_boosted_count} item(s) had their value increased! (+{flat_price} flat, +{percent_price}%)")
+    # Phase 2: Show all inventories
+    flush_output()
+    print("\n" + SEP)
+    print("📋 PHASE 2: INVENTORY SUMMARY")
+    print(SEP)
 
-            net_value = total_value - total_cost
-            print(f"\nTotal value: {total_value}g")
-            print(f"Net gain/loss: {net_value:+d}g")
-            print(f"{player.name}'s gold: {player.gold}g | Inventory: {len(player.inventory)} items")
+    if not drew_this_turn:
+        print("No players drew this turn. Skipping summary.")
 
-        except ValueError:
-            print("Invalid input! Skipping this player.")
+    for player_name, player in players:
+        # Only summarize players whose inventory changed this turn
+        if player_name not in drew_this_turn:
             continue
 
-    # Phase 2: Show all inventories
-    print("\n" + "=" * 60)
-    print("📋 PHASE 2: INVENTORY SUMMARY")
-    print("=" * 60)
-
-    for player_name, player in game.players.items():
+        inv = player.inventory
         print(f"\n--- {player_name} ---")
-        print(f"Gold: {player.gold}g | Items: {len(player.inventory)}")
+        print(f"Gold: {player.gold}g | Items: {len(inv)}")
 
-        if player.inventory:
+        if inv:
             # Group items by name for compact display
             item_groups = {}
-            for item in player.inventory:
+            for item in inv:
                 key = item.name
                 if key not in item_groups:
                     item_groups[key] = []
@@ -2585,25 +3046,27 @@ def quick_turn_menu(game):
             print("  (No items)")
 
     # Phase 3: Crafting phase
-    print("\n" + "=" * 60)
+    flush_output()
+    print("\n" + SEP)
     print("🔨 PHASE 3: CRAFTING")
-    print("=" * 60)
+    print(SEP)
 
     # Get craftable items (master items with recipes)
-    craftable_items = [item for item in game.master_items if item.recipe]
+    craftable_items = game.get_craftable_items()
 
     if not craftable_items:
         print("No crafting recipes available. Skipping crafting phase.")
     else:
-        for player_name, player in game.players.items():
+        for player_name, player in players:
             print(f"\n--- {player_name}'s Crafting Turn ---")
+            inv = player.inventory
 
-            if not player.inventory:
+            if not inv:
                 print(f"{player_name} has no items to craft with. Skipping.")
                 continue
 
             while True:
-                craft_choice = input(f"\n{player_name}, craft an item? (y/n or 'done'): ").strip().lower()
+                craft_choice = read_input(f"\n{player_name}, craft an item? (y/n or 'done'): ").strip().lower()
 
                 if craft_choice in ['n', 'done']:
                     break
@@ -2615,174 +3078,178 @@ def quick_turn_menu(game):
                 # Show available recipes
                 print("\nAvailable recipes:")
                 for i, master_item in enumerate(craftable_items):
-                    ingredient_counts = {}
-                    for ing in master_item.recipe:
-                        ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                    ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                       for name, count in ingredient_counts.items()]
-                    print(f"  {i}. {master_item.name} ({master_item.item_type}, {master_item.gold_value_per_unit}g) = [{', '.join(ingredient_parts)}]")
+                    print(f"  {i}. {master_item.name} ({master_item.item_type}, {master_item.gold_value_per_unit}g) = [{master_item.format_recipe()}]")
 
-                try:
-                    recipe_index = int(input("\nEnter recipe number to craft (or -1 to skip): ").strip())
-                    if recipe_index == -1:
-                        break
+                recipe_index = prompt_int("\nEnter recipe number to craft (or -1 to skip): ",
+                                          lo=-1, hi=len(craftable_items) - 1,
+                                          range_error="Invalid recipe number!")
+                if recipe_index is None:
+                    continue
+                if recipe_index == -1:
+                    break
 
-                    if recipe_index < 0 or recipe_index >= len(craftable_items):
-                        print("Invalid recipe number!")
-                        continue
+                master_item = craftable_items[recipe_index]
 
-                    master_item = craftable_items[recipe_index]
+                required_ingredients = master_item.required_counts
 
-                    # Count required quantities for each ingredient
-                    required_ingredients = {}
-                    for ingredient in master_item.recipe:
-                        required_ingredients[ingredient] = required_ingredients.get(ingredient, 0) + 1
+                # Check if player has all ingredients in required quantities
+                missing_ingredients = []
+                for ingredient, required_count in required_ingredients.items():
+                    total_quantity = player.get_item_count(ingredient)
+                    if total_quantity < required_count:
+                        missing_ingredients.append(f"{ingredient} ({total_quantity}/{required_count})")
 
-                    # Check if player has all ingredients in required quantities
-                    missing_ingredients = []
-                    for ingredient, required_count in required_ingredients.items():
-                        total_quantity = sum(item.quantity for item in player.inventory if item.name == ingredient)
-                        if total_quantity < required_count:
-                            missing_ingredients.append(f"{ingredient} ({total_quantity}/{required_count})")
+                if missing_ingredients:
+                    print(f"❌ Missing ingredients: {', '.join(missing_ingredients)}")
+                    continue
 
-                    if missing_ingredients:
-                        print(f"❌ Missing ingredients: {', '.join(missing_ingredients)}")
-                        continue
+                # Remove ingredients from inventory
+                for ingredient, required_count in required_ingredients.items():
+                    player.consume_item_by_name(ingredient, required_count)
 
-                    # Remove ingredients from inventory
-                    for ingredient in master_item.recipe:
-                        player.consume_item_by_name(ingredient, 1)
-
-                    # Create and add crafted item
-                    crafted_item = LootItem(master_item.name, 0, master_item.gold_value_per_unit, master_item.item_type)
-
-                    # If Equipment or Upgrade, allow player to roll for functional enchantments
-                    if master_item.item_type.lower() in ["equipment", "upgrade"]:
-                        # Get functional enchantments from the unified enchantments list
-                        functional_enchants = [e for e in game.enchantments if e.enchantment_type == "functional"]
-
-                        if not functional_enchants:
-                            print(f"\n⚠️  No functional enchantments available! Item crafted without effects.")
-                            if master_item.item_type.lower() == "equipment":
-                                rarity = game.rarity_system.roll_rarity()
-                                crafted_item.rarity = rarity
-                                print(f"✓ Crafted [{rarity}] {master_item.name} (0 effects)")
-                            else:
-                                print(f"✓ Crafted {master_item.name} (0 effects)")
+                # Create and add crafted item
+                crafted_item = LootItem(master_item.name, 0, master_item.gold_value_per_unit, master_item.item_type)
+
+                # If Equipment or Upgrade, allow player to roll for functional enchantments
+                if master_item.item_type_lower in ("equipment", "upgrade"):
+                    # Get functional enchantments from the unified enchantments list
+                    functional_enchants, _ = game.get_functional_enchantments()
+
+                    if not functional_enchants:
+                        print(f"\n⚠️  No functional enchantments available! Item crafted without effects.")
+                        if master_item.item_type_lower == "equipment":
+                            rarity = game.rarity_system.roll_rarity()
+                            crafted_item.rarity = rarity
+                            print(f"✓ Crafted [{rarity}] {master_item.name} (0 effects)")
                         else:
-                            # For Equipment, roll rarity first
-                            max_effects = None
-                            if master_item.item_type.lower() == "equipment":
-                                rarity = game.rarity_system.roll_rarity()
-                                crafted_item.rarity = rarity
-                                max_effects = game.rarity_system.get_max_effects(rarity)
-                                print(f"\n✨ Rolled [{rarity}] {master_item.name}! (Max {max_effects} effects)")
-                            else:
-                                print(f"\n✓ Crafted {master_item.name}!")
-
-                            # Roll for functional enchantments
-                            print(f"\nRoll for effects? Cost: {game.functional_enchant_cost}g per roll")
-                            print(f"Your gold: {player.gold}g")
-
-                            effects_added = 0
-                            while True:
-                                # Check if Equipment has reached max effects
-                                if max_effects and effects_added >= max_effects:
-                                    print(f"\n✓ Reached maximum effects for {rarity} rarity ({max_effects})!")
-                                    break
-
-                                roll_choice = input(f"\nRoll for effect #{effects_added + 1}? (y/n): ").strip().lower()
-                                if roll_choice != 'y':
-                                    break
-
-                                # Check if player has enough currency
-                                if player.gold < game.functional_enchant_cost:
-                                    print(f"❌ Not enough gold! Need {game.functional_enchant_cost}g, have {player.gold}g")
-                                    break
-
-                                # Deduct cost and roll for functional enchantment
-                                player.remove_gold(game.functional_enchant_cost)
-                                weights = [ench.weight for ench in functional_enchants]
-                                rolled_enchant = random.choices(functional_enchants, weights=weights, k=1)[0]
-                                crafted_item.add_enchantment(rolled_enchant, rolled_value=None)  # No rolled value for functional
-                                effects_added += 1
-
-                                print(f"🎲 Rolled: {rolled_enchant.name}")
-                                print(f"   Effect: {rolled_enchant.get_effect_string()}")
-                                print(f"   gold: {player.gold}g")
-
-                            print(f"\n✓ Final item: {crafted_item.get_display_name()} ({effects_added} effects)")
+                            print(f"✓ Crafted {master_item.name} (0 effects)")
                     else:
-                        print(f"✓ Crafted {master_item.name}!")
+                        # For Equipment, roll rarity first
+                        max_effects = None
+                        if master_item.item_type_lower == "equipment":
+                            rarity = game.rarity_system.roll_rarity()
+                            crafted_item.rarity = rarity
+                            max_effects = game.rarity_system.get_max_effects(rarity)
+                            print(f"\n✨ Rolled [{rarity}] {master_item.name}! (Max {max_effects} effects)")
+                        else:
+                            print(f"\n✓ Crafted {master_item.name}!")
+
+                        # Roll for functional enchantments
+                        print(f"\nRoll for effects? Cost: {game.functional_enchant_cost}g per roll")
+                        print(f"Your gold: {player.gold}g")
+
+                        effects_added = 0
+                        while True:
+                            # Check if Equipment has reached max effects
+                            if max_effects and effects_added >= max_effects:
+                                print(f"\n✓ Reached maximum effects for {rarity} rarity ({max_effects})!")
+                                break
+
+                            roll_choice = read_input(f"\nRoll for effect #{effects_added + 1}? (y/n): ").strip().lower()
+                            if roll_choice != 'y':
+                                break
+
+                            # Check if player has enough currency
+                            if player.gold < game.functional_enchant_cost:
+                                print(f"❌ Not enough gold! Need {game.functional_enchant_cost}g, have {player.gold}g")
+                                break
+
+                            # Deduct cost and roll for functional enchantment
+                            player.remove_gold(game.functional_enchant_cost)
+                            rolled_enchant = game.roll_functional_enchantment()
+                            crafted_item.add_enchantment(rolled_enchant, rolled_value=None)  # No rolled value for functional
+                            effects_added += 1
+
+                            print(f"🎲 Rolled: {rolled_enchant.name}")
+                            print(f"   Effect: {rolled_enchant.get_effect_string()}")
+                            print(f"   gold: {player.gold}g")
+
+                        print(f"\n✓ Final item: {crafted_item.get_display_name()} ({effects_added} effects)")
+                else:
+                    print(f"✓ Crafted {master_item.name}!")
 
-                    # Apply crafted sell price increase
-                    flat_craft_price, percent_craft_price = player.get_crafted_sell_price_increase()
-                    if flat_craft_price > 0 or percent_craft_price > 0:
-                        original_craft_value = crafted_item.gold_value
-                        crafted_item.gold_value = player.calculate_item_value(original_craft_value, is_crafted=True)
-                        if crafted_item.gold_value > original_craft_value:
-                            print(f"💰 Crafted item value increased: {original_craft_value}g → {crafted_item.gold_value}g (+{flat_craft_price} flat, +{percent_craft_price}%)")
+                # Apply crafted sell price increase
+                flat_craft_price, percent_craft_price = player.get_crafted_sell_price_increase()
+                if flat_craft_price > 0 or percent_craft_price > 0:
+                    original_craft_value = crafted_item.gold_value
+                    crafted_item.gold_value = player.calculate_item_value(original_craft_value, is_crafted=True)
+                    if crafted_item.gold_value > original_craft_value:
+                        print(f"💰 Crafted item value increased: {original_craft_value}g → {crafted_item.gold_value}g (+{flat_craft_price} flat, +{percent_craft_price}%)")
 
-                    player.add_item(crafted_item)
-                    print(f"\nAdded to inventory: {crafted_item}")
-
-                except ValueError:
-                    print("Invalid input!")
-                    continue
+                player.add_item(crafted_item)
+                print(f"\nAdded to inventory: {crafted_item}")
 
     # Phase 4: Selling phase
-    print("\n" + "=" * 60)
+    flush_output()
+    print("\n" + SEP)
     print("💰 PHASE 4: SELLING")
-    print("=" * 60)
+    print(SEP)
 
-    for player_name, player in game.players.items():
+    for player_name, player in players:
         print(f"\n--- {player_name}'s Selling Turn ---")
+        inv = player.inventory
 
-        if not player.inventory:
+        if not inv:
             print(f"{player_name} has no items to sell. Skipping.")
             continue
 
+        show_inventory = True
         while True:
-            print(f"\n{player_name}'s Inventory:")
-            print(f"Gold: {player.gold}g")
-            print("Items:")
-            for i, item in enumerate(player.inventory):
-                print(f"  {i}. {item}")
+            # Only re-list the inventory after a sale changed the item numbers
+            if show_inventory:
+                print(f"\n{player_name}'s Inventory:")
+                print(f"Gold: {player.gold}g")
+                print("Items:")
+                for i, item in enumerate(inv):
+                    print(f"  {i}. {item}")
+                show_inventory = False
 
-            sell_choice = input(f"\n{player_name}, enter item number to sell (or 'done' to finish): ").strip().lower()
+            sell_choice = read_input(f"\n{player_name}, enter item number(s) to sell, comma-separated (or 'done' to finish): ").strip().lower()
 
             if sell_choice == 'done':
                 break
 
             try:
-                index = int(sell_choice)
-                if index < 0 or index >= len(player.inventory):
-                    print("Invalid item number!")
-                    continue
+                # Sell from highest index to lowest so earlier indices stay valid
+                indices = sorted({int(x) for x in sell_choice.split(",")}, reverse=True)
+            except ValueError:
+                print("Invalid input! Enter item number(s) or 'done'")
+                continue
 
-                item = player.inventory[index]
-                player.remove_item(index)
+            if indices[-1] < 0 or indices[0] >= len(inv):
+                print("Invalid item number!")
+                continue
+
+            if len(indices) == 1:
+                item = player.remove_item(indices[0])
                 player.add_gold(item.gold_value)
                 print(f"✓ Sold {item.name} for {item.gold_value}g!")
-                print(f"New gold balance: {player.gold}g")
-
-                if not player.inventory:
-                    print(f"\n{player.name} has sold all items!")
-                    break
+            else:
+                sold_names = []
+                sold_value = 0
+                for index in indices:
+                    item = player.remove_item(index)
+                    sold_names.append(item.name)
+                    sold_value += item.gold_value
+                player.add_gold(sold_value)
+                print(f"✓ Sold {len(sold_names)} items ({', '.join(reversed(sold_names))}) for {sold_value}g!")
+            print(f"New gold balance: {player.gold}g")
+            show_inventory = True
 
-            except ValueError:
-                print("Invalid input! Enter a number or 'done'")
+            if not inv:
+                print(f"\n{player.name} has sold all items!")
+                break
 
-    print("\n" + "=" * 60)
+    print("\n" + SEP)
     print("✅ QUICK TURN COMPLETE!")
-    print("=" * 60)
+    print(SEP)
 
 
 def manage_crafting(game):
     """Manage crafting recipes stored in master items."""
     while True:
         show_crafting_menu()
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # Add recipe to a master item
@@ -2796,30 +3263,29 @@ def manage_crafting(game):
                 print(f"  {i}. {item.name} ({item.item_type}) [{recipe_status}]")
 
             try:
-                index = int(input("\nEnter item number to add/edit recipe: ").strip())
+                index = int(read_input("\nEnter item number to add/edit recipe: ").strip())
                 if index < 0 or index >= len(game.master_items):
                     print("Invalid item number!")
                     continue
 
                 master_item = game.master_items[index]
                 master_item.recipe = []  # Reset recipe
+                game.invalidate_master_item_cache()
 
                 print(f"\nAdding recipe to {master_item.name}")
                 print("Type 'done' when finished adding ingredients")
                 
                 while True:
-                    ingredient = input("Add ingredient (or 'done' to finish): ").strip()
+                    ingredient = read_input("Add ingredient (or 'done' to finish): ").strip()
                     if ingredient.lower() == 'done':
                         break
                     if ingredient:
                         try:
-                            quantity = int(input(f"How many {ingredient}? ").strip())
+                            quantity = int(read_input(f"How many {ingredient}? ").strip())
                             if quantity <= 0:
                                 print("Quantity must be at least 1!")
                                 continue
-                            # Add the ingredient the specified number of times
-                            for _ in range(quantity):
-                                master_item.recipe.append(ingredient)
+                            master_item.add_ingredient(ingredient, quantity)
                             print(f"✓ Added {quantity}x {ingredient}")
                         except ValueError:
                             print("Invalid quantity! Please enter a number.")
@@ -2829,18 +3295,13 @@ def manage_crafting(game):
                     continue
 
                 # Display recipe
-                ingredient_counts = {}
-                for ing in master_item.recipe:
-                    ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                   for name, count in ingredient_counts.items()]
-                print(f"✓ Recipe set for {master_item.name}: [{', '.join(ingredient_parts)}]")
+                print(f"✓ Recipe set for {master_item.name}: [{master_item.format_recipe()}]")
             except ValueError:
                 print("Invalid input!")
 
         elif choice == "2":
             # Remove recipe from master item
-            craftable_items = [item for item in game.master_items if item.recipe]
+            craftable_items = game.get_craftable_items()
 
             if not craftable_items:
                 print("No items have recipes!")
@@ -2848,28 +3309,24 @@ def manage_crafting(game):
 
             print("\nItems with recipes:")
             for i, item in enumerate(craftable_items):
-                ingredient_counts = {}
-                for ing in item.recipe:
-                    ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                   for name, count in ingredient_counts.items()]
-                print(f"  {i}. {item.name} = [{', '.join(ingredient_parts)}]")
+                print(f"  {i}. {item.name} = [{item.format_recipe()}]")
 
             try:
-                index = int(input("\nEnter item number to remove recipe: ").strip())
+                index = int(read_input("\nEnter item number to remove recipe: ").strip())
                 if index < 0 or index >= len(craftable_items):
                     print("Invalid item number!")
                     continue
 
                 item = craftable_items[index]
                 item.recipe = []
+                game.invalidate_master_item_cache()
                 print(f"✓ Removed recipe from {item.name}")
             except ValueError:
                 print("Invalid input!")
 
         elif choice == "3":
             # View all recipes
-            craftable_items = [item for item in game.master_items if item.recipe]
+            craftable_items = game.get_craftable_items()
 
             if not craftable_items:
                 print("No recipes exist!")
@@ -2877,12 +3334,7 @@ def manage_crafting(game):
 
             print("\nAll Crafting Recipes:")
             for i, item in enumerate(craftable_items):
-                ingredient_counts = {}
-                for ing in item.recipe:
-                    ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                   for name, count in ingredient_counts.items()]
-                print(f"  {i}. {item.name} ({item.item_type}, {item.gold_value_per_unit}g) = [{', '.join(ingredient_parts)}]")
+                print(f"  {i}. {item.name} ({item.item_type}, {item.gold_value_per_unit}g) = [{item.format_recipe()}]")
 
         elif choice == "4":
             # Edit existing recipe (same as add)
@@ -2890,7 +3342,7 @@ def manage_crafting(game):
                 print("No master items exist!")
                 continue
 
-            craftable_items = [item for item in game.master_items if item.recipe]
+            craftable_items = game.get_craftable_items()
 
             if not craftable_items:
                 print("No items have recipes!")
@@ -2898,48 +3350,38 @@ def manage_crafting(game):
 
             print("\nItems with recipes:")
             for i, item in enumerate(craftable_items):
-                ingredient_counts = {}
-                for ing in item.recipe:
-                    ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                   for name, count in ingredient_counts.items()]
-                print(f"  {i}. {item.name} = [{', '.join(ingredient_parts)}]")
+                print(f"  {i}. {item.name} = [{item.format_recipe()}]")
 
             try:
-                index = int(input("\nEnter item number to edit recipe: ").strip())
+                index = int(read_input("\nEnter item number to edit recipe: ").strip())
                 if index < 0 or index >= len(craftable_items):
                     print("Invalid item number!")
                     continue
 
                 master_item = craftable_items[index]
                 master_item.recipe = []  # Reset recipe
+                game.invalidate_master_item_cache()
 
                 print(f"\nEditing recipe for {master_item.name}")
                 print("Type 'done' when finished adding ingredients")
                 
                 while True:
-                    ingredient = input("Add ingredient (or 'done' to finish): ").strip()
+                    ingredient = read_input("Add ingredient (or 'done' to finish): ").strip()
                     if ingredient.lower() == 'done':
                         break
                     if ingredient:
                         try:
-                            quantity = int(input(f"How many {ingredient}? ").strip())
+                            quantity = int(read_input(f"How many {ingredient}? ").strip())
                             if quantity <= 0:
                                 print("Quantity must be at least 1!")
                                 continue
-                            for _ in range(quantity):
-                                master_item.recipe.append(ingredient)
+                            master_item.add_ingredient(ingredient, quantity)
                             print(f"✓ Added {quantity}x {ingredient}")
                         except ValueError:
                             print("Invalid quantity! Please enter a number.")
 
                 if master_item.recipe:
-                    ingredient_counts = {}
-                    for ing in master_item.recipe:
-                        ingredient_counts[ing] = ingredient_counts.get(ing, 0) + 1
-                    ingredient_parts = [f"{count}x {name}" if count > 1 else name
-                                       for name, count in ingredient_counts.items()]
-                    print(f"✓ Recipe updated for {master_item.name}: [{', '.join(ingredient_parts)}]")
+                    print(f"✓ Recipe updated for {master_item.name}: [{master_item.format_recipe()}]")
             except ValueError:
                 print("Invalid input!")
 
@@ -2948,244 +3390,254 @@ def manage_crafting(game):
 
 
 
-def manage_enchantments(game):
-    while True:
-        show_enchantment_menu()
-        choice = input("Enter choice: ").strip()
+def enchantment_add(game):
+    """Add a new monetary enchantment."""
+    name = read_input("Enter enchantment name: ").strip()
+    if not name:
+        print("Name cannot be empty!")
+        return
 
-        if choice == "1":
-            name = input("Enter enchantment name: ").strip()
-            if not name:
-                print("Name cannot be empty!")
-                continue
+    enchant_type = read_input("Enter enchantment type (e.g., weapon, armor, misc): ").strip() or "misc"
 
-            enchant_type = input("Enter enchantment type (e.g., weapon, armor, misc): ").strip() or "misc"
+    is_percentage_input = read_input("Is this a percentage-based enchantment? (y/n): ").strip().lower()
+    is_percentage = is_percentage_input == 'y'
 
-            is_percentage_input = input("Is this a percentage-based enchantment? (y/n): ").strip().lower()
-            is_percentage = is_percentage_input == 'y'
+    try:
+        if is_percentage:
+            print("\nEnter percentage range (can be negative for penalty, positive for bonus)")
+            print("Example: -50 to 50 means it could reduce value by 50% or increase by 50%")
+            min_value = float(read_input("Minimum percentage: ").strip())
+            max_value = float(read_input("Maximum percentage: ").strip())
+        else:
+            print(f"\nEnter flat gold range (can be negative for penalty, positive for bonus)")
+            print("Example: -100 to 200 means it could reduce value by 100g or increase by 200g")
+            min_value = float(read_input(f"Minimum gold value: ").strip())
+            max_value = float(read_input(f"Maximum gold value: ").strip())
 
-            try:
-                if is_percentage:
-                    print("\nEnter percentage range (can be negative for penalty, positive for bonus)")
-                    print("Example: -50 to 50 means it could reduce value by 50% or increase by 50%")
-                    min_value = float(input("Minimum percentage: ").strip())
-                    max_value = float(input("Maximum percentage: ").strip())
-                else:
-                    print(f"\nEnter flat gold range (can be negative for penalty, positive for bonus)")
-                    print("Example: -100 to 200 means it could reduce value by 100g or increase by 200g")
-                    min_value = float(input(f"Minimum gold value: ").strip())
-                    max_value = float(input(f"Maximum gold value: ").strip())
+        if min_value > max_value:
+            print("Minimum value cannot be greater than maximum value!")
+            return
 
-                if min_value > max_value:
-                    print("Minimum value cannot be greater than maximum value!")
-                    continue
+        cost_amount = int(read_input(f"Enter cost (number of {game.enchant_cost_item or 'cost items'} required): ").strip() or "1")
+        if cost_amount < 0:
+            print("Cost cannot be negative!")
+            return
 
-                cost_amount = int(input(f"Enter cost (number of {game.enchant_cost_item or 'cost items'} required): ").strip() or "1")
-                if cost_amount < 0:
-                    print("Cost cannot be negative!")
-                    continue
+        enchant = Enchantment(name, enchant_type, min_value, max_value, is_percentage, cost_amount)
+        game.enchantments.append(enchant)
+        game.invalidate_enchantment_cache()
+        print(f"✓ Added enchantment: {enchant}")
+    except ValueError:
+        print("Invalid input!")
 
-                enchant = Enchantment(name, enchant_type, min_value, max_value, is_percentage, cost_amount)
-                game.enchantments.append(enchant)
-                print(f"✓ Added enchantment: {enchant}")
-            except ValueError:
-                print("Invalid input!")
 
-        elif choice == "2":
-            if not game.enchantments:
-                print("No enchantments exist!")
-                continue
+def enchantment_edit(game):
+    """Edit an existing enchantment."""
+    if not game.enchantments:
+        print("No enchantments exist!")
+        return
 
-            print("\nCurrent enchantments:")
-            for i, ench in enumerate(game.enchantments):
-                print(f"  {i}. {ench}")
+    print("\nCurrent enchantments:")
+    print("\n".join(f"  {i}. {ench}" for i, ench in enumerate(game.enchantments)))
 
-            try:
-                index = int(input("\nEnter enchantment number to edit: ").strip())
-                if index < 0 or index >= len(game.enchantments):
-                    print("Invalid enchantment number!")
-                    continue
+    try:
+        index = int(read_input("\nEnter enchantment number to edit: ").strip())
+        if index < 0 or index >= len(game.enchantments):
+            print("Invalid enchantment number!")
+            return
 
-                ench = game.enchantments[index]
-                print(f"\nEditing: {ench.name}")
-                print("Leave blank to keep current value")
+        ench = game.enchantments[index]
+        print(f"\nEditing: {ench.name}")
+        print("Leave blank to keep current value")
+
+        new_name = read_input(f"New name [{ench.name}]: ").strip()
+        new_type = read_input(f"New type [{ench.enchant_type}]: ").strip()
+
+        value_type = "percentage" if ench.is_percentage else "flat"
+        min_input = read_input(f"New minimum {value_type} [{ench.min_value}]: ").strip()
+        max_input = read_input(f"New maximum {value_type} [{ench.max_value}]: ").strip()
+        cost_input = read_input(f"New cost [{ench.cost_amount}]: ").strip()
+
+        # Parse before changing anything, so a bad value leaves the enchantment and the caches as they were
+        new_min = float(min_input) if min_input else None
+        new_max = float(max_input) if max_input else None
+        new_cost = int(cost_input) if cost_input else None
+
+        if new_name:
+            ench.name = new_name
+        if new_type:
+            ench.enchant_type = new_type
+        if new_min is not None:
+            if new_min <= ench.max_value:
+                ench.min_value = new_min
+            else:
+                print("Minimum cannot be greater than maximum!")
+        if new_max is not None:
+            if new_max >= ench.min_value:
+                ench.max_value = new_max
+            else:
+                print("Maximum cannot be less than minimum!")
+        if new_cost is not None:
+            ench.cost_amount = new_cost
 
-                new_name = input(f"New name [{ench.name}]: ").strip()
-                new_type = input(f"New type [{ench.enchant_type}]: ").strip()
+        game.invalidate_enchantment_cache()
+        print(f"✓ Updated enchantment!")
+    except ValueError:
+        print("Invalid input!")
 
-                value_type = "percentage" if ench.is_percentage else "flat"
-                min_input = input(f"New minimum {value_type} [{ench.min_value}]: ").strip()
-                max_input = input(f"New maximum {value_type} [{ench.max_value}]: ").strip()
-                cost_input = input(f"New cost [{ench.cost_amount}]: ").strip()
 
-                if new_name:
-                    ench.name = new_name
-                if new_type:
-                    ench.enchant_type = new_type
-                if min_input:
-                    new_min = float(min_input)
-                    if new_min <= ench.max_value:
-                        ench.min_value = new_min
-                    else:
-                        print("Minimum cannot be greater than maximum!")
-                if max_input:
-                    new_max = float(max_input)
-                    if new_max >= ench.min_value:
-                        ench.max_value = new_max
-                    else:
-                        print("Maximum cannot be less than minimum!")
-                if cost_input:
-                    ench.cost_amount = int(cost_input)
+def enchantment_delete(game):
+    """Delete an enchantment."""
+    if not game.enchantments:
+        print("No enchantments exist!")
+        return
 
-                print(f"✓ Updated enchantment!")
-            except ValueError:
-                print("Invalid input!")
+    print("\nCurrent enchantments:")
+    print("\n".join(f"  {i}. {ench}" for i, ench in enumerate(game.enchantments)))
 
-        elif choice == "3":
-            if not game.enchantments:
-                print("No enchantments exist!")
-                continue
+    try:
+        index = int(read_input("\nEnter enchantment number to delete: ").strip())
+        if 0 <= index < len(game.enchantments):
+            deleted = game.enchantments.pop(index)
+            game.invalidate_enchantment_cache()
+            print(f"✓ Deleted enchantment: {deleted.name}")
+        else:
+            print("Invalid enchantment number!")
+    except ValueError:
+        print("Invalid input!")
 
-            print("\nCurrent enchantments:")
-            for i, ench in enumerate(game.enchantments):
-                print(f"  {i}. {ench}")
 
-            try:
-                index = int(input("\nEnter enchantment number to delete: ").strip())
-                if 0 <= index < len(game.enchantments):
-                    deleted = game.enchantments.pop(index)
-                    print(f"✓ Deleted enchantment: {deleted.name}")
-                else:
-                    print("Invalid enchantment number!")
-            except ValueError:
-                print("Invalid input!")
+def enchantment_set_cost(game):
+    """Set the global enchantment cost item and amount."""
+    print(f"\nCurrent global enchantment cost: {game.enchant_cost_amount}x {game.enchant_cost_item or 'None'}")
 
-        elif choice == "4":
-            print(f"\nCurrent global enchantment cost: {game.enchant_cost_amount}x {game.enchant_cost_item or 'None'}")
+    print("\nAvailable items from all tables:")
+    print("\n".join(f"  - {item_name}" for item_name in game.get_all_item_names()))
 
-            print("\nAvailable items from all tables:")
-            all_item_names = set()
-            for table in game.loot_tables:
-                for item in table.items:
-                    all_item_names.add(item.name)
-            for item_name in sorted(all_item_names):
-                print(f"  - {item_name}")
+    new_cost = read_input("Enter enchantment cost item name (leave blank for none): ").strip() or None
+    new_amount = 1
+    if new_cost:
+        new_amount = int(read_input("How many of this item per enchant? (default 1): ").strip() or "1")
 
-            new_cost = input("Enter enchantment cost item name (leave blank for none): ").strip() or None
-            new_amount = 1
-            if new_cost:
-                new_amount = int(input("How many of this item per enchant? (default 1): ").strip() or "1")
+    game.enchant_cost_item = new_cost
+    game.enchant_cost_amount = new_amount
+    print(f"✓ Set global enchantment cost to: {new_amount}x {new_cost or 'None'}")
 
-            game.enchant_cost_item = new_cost
-            game.enchant_cost_amount = new_amount
-            print(f"✓ Set global enchantment cost to: {new_amount}x {new_cost or 'None'}")
 
-        elif choice == "5":
-            if not game.enchantments:
-                print("No enchantments exist!")
-                continue
+def enchantment_view_all(game):
+    """Show all enchantments and the global cost item."""
+    if not game.enchantments:
+        print("No enchantments exist!")
+        return
 
-            print(f"\n{'=' * 60}")
-            print(f"Global Enchantment Cost Item: {game.enchant_cost_item or 'None'}")
-            print(f"{'=' * 60}")
-            print("\nAll Enchantments:")
-            for i, ench in enumerate(game.enchantments):
-                print(f"  {i}. {ench}")
+    lines = ["\n" + SEP,
+             f"Global Enchantment Cost Item: {game.enchant_cost_item or 'None'}",
+             SEP,
+             "\nAll Enchantments:"]
+    lines.extend(f"  {i}. {ench}" for i, ench in enumerate(game.enchantments))
+    print("\n".join(lines))
 
-        elif choice == "6":
-            if not game.enchantments:
-                print("No enchantments exist!")
-                continue
 
-            if not game.players:
-                print("No players exist!")
-                continue
+def enchantment_apply_to_item(game):
+    """Let a player pay the enchant cost to enchant an inventory item."""
+    if not game.enchantments:
+        print("No enchantments exist!")
+        return
 
-            print("\nAvailable players:")
-            for name, player in game.players.items():
-                current_marker = " <-- CURRENT" if name == game.current_player_name else ""
-                print(f"  - {name}{current_marker}")
+    if not game.players:
+        print("No players exist!")
+        return
 
-            player_name = get_player_name_input(game)
-            player = game.get_player(player_name)
+    show_available_players(game)
 
-            if not player:
-                print(f"Player '{player_name}' not found!")
-                continue
+    player_name = get_player_name_input(game)
+    player = game.get_player(player_name)
 
-            if not player.inventory:
-                print(f"{player.name} has no items!")
-                continue
+    if not player:
+        print(f"Player '{player_name}' not found!")
+        return
 
-            print(f"\n{player.name}'s inventory:")
-            for i, item in enumerate(player.inventory):
-                print(f"  {i}. {item} [Type: {item.item_type}]")
+    if not player.inventory:
+        print(f"{player.name} has no items!")
+        return
 
-            try:
-                item_index = int(input("\nEnter item number to enchant: ").strip())
-                if item_index < 0 or item_index >= len(player.inventory):
-                    print("Invalid item number!")
-                    continue
+    print(f"\n{player.name}'s inventory:")
+    print("\n".join(f"  {i}. {item} [Type: {item.item_type}]" for i, item in enumerate(player.inventory)))
 
-                item = player.inventory[item_index]
+    try:
+        item_index = int(read_input("\nEnter item number to enchant: ").strip())
+        if item_index < 0 or item_index >= len(player.inventory):
+            print("Invalid item number!")
+            return
 
-                # Show all enchantments compatible with this item type
-                compatible_enchants = [e for e in game.enchantments if e.enchant_type == item.item_type or e.enchant_type == "misc"]
+        item = player.inventory[item_index]
 
-                if not compatible_enchants:
-                    print(f"No enchantments compatible with type '{item.item_type}'!")
-                    continue
+        # Show all enchantments compatible with this item type
+        compatible_enchants = game.get_compatible_enchantments(item.item_type)
 
-                print(f"\nCompatible enchantments for {item.name}:")
-                for i, ench in enumerate(compatible_enchants):
-                    print(f"  {i}. {ench}")
+        if not compatible_enchants:
+            print(f"No enchantments compatible with type '{item.item_type}'!")
+            return
 
-                ench_index = int(input("\nSelect enchantment number: ").strip())
-                if ench_index < 0 or ench_index >= len(compatible_enchants):
-                    print("Invalid enchantment number!")
-                    continue
+        print(f"\nCompatible enchantments for {item.name}:")
+        print("\n".join(f"  {i}. {ench}" for i, ench in enumerate(compatible_enchants)))
 
-                selected_enchant = compatible_enchants[ench_index]
+        ench_index = int(read_input("\nSelect enchantment number: ").strip())
+        if ench_index < 0 or ench_index >= len(compatible_enchants):
+            print("Invalid enchantment number!")
+            return
 
-                # Check if player has enough cost items
-                if game.enchant_cost_item:
-                    # Count total quantity of cost item
-                    cost_item_count = sum(inv_item.quantity for inv_item in player.inventory if inv_item.name == game.enchant_cost_item)
+        selected_enchant = compatible_enchants[ench_index]
 
-                    if cost_item_count < selected_enchant.cost_amount:
-                        print(f"❌ Not enough {game.enchant_cost_item}! Need {selected_enchant.cost_amount}, have {cost_item_count}")
-                        continue
+        # Check if player has enough cost items (zero-cost enchantments skip the check entirely)
+        cost_item = game.enchant_cost_item
+        cost_amount = selected_enchant.cost_amount
+        if cost_item and cost_amount > 0:
+            # consume_item_by_name checks the running total first and consumes nothing if short
+            if not player.consume_item_by_name(cost_item, cost_amount):
+                print(f"❌ Not enough {cost_item}! Need {cost_amount}, have {player.get_item_count(cost_item)}")
+                return
+            print(f"💰 Consumed {cost_amount}x {cost_item}")
 
-                    # Consume the cost items
-                    player.consume_item_by_name(game.enchant_cost_item, selected_enchant.cost_amount)
-                    print(f"💰 Consumed {selected_enchant.cost_amount}x {game.enchant_cost_item}")
+        # Apply the enchantment and get the rolled value
+        original_value = item.gold_value
+        rolled_value = selected_enchant.apply_to_item(item)
 
-                    # Update item_index if items were removed before it
-                    new_item_index = 0
-                    for i, inv_item in enumerate(player.inventory):
-                        if inv_item is item:
-                            item_index = i
-                            break
+        # Store the enchantment with its rolled value
+        item.enchantments.append((selected_enchant, rolled_value))
+        player.unindex_stack(item)
 
-                # Apply the enchantment and get the rolled value
-                original_value = item.gold_value
-                rolled_value = selected_enchant.apply_to_item(item)
+        print(f"\n✨ Applied enchantment: {selected_enchant.name}")
+        if selected_enchant.is_percentage:
+            print(f"   Rolled: {rolled_value:+.1f}%")
+        else:
+            print(f"   Rolled: {rolled_value:+.0f}g")
+        print(f"   Item value: {original_value}g → {item.gold_value}g")
+        print(f"\n✓ New item: {item}")
+    except ValueError:
+        print("Invalid input!")
 
-                # Store the enchantment with its rolled value
-                item.enchantments.append((selected_enchant, rolled_value))
 
-                print(f"\n✨ Applied enchantment: {selected_enchant.name}")
-                if selected_enchant.is_percentage:
-                    print(f"   Rolled: {rolled_value:+.1f}%")
-                else:
-                    print(f"   Rolled: {rolled_value:+.0f}g")
-                print(f"   Item value: {original_value}g → {item.gold_value}g")
-                print(f"\n✓ New item: {item}")
-            except ValueError:
-                print("Invalid input!")
+ENCHANTMENT_HANDLERS = {
+    "1": enchantment_add,
+    "2": enchantment_edit,
+    "3": enchantment_delete,
+    "4": enchantment_set_cost,
+    "5": enchantment_view_all,
+    "6": enchantment_apply_to_item,
+}
 
-        elif choice == "7":
+
+def manage_enchantments(game):
+    while True:
+        show_enchantment_menu()
+        choice = read_input("Enter choice: ").strip()
+
+        if choice == "7":
             break
+        handler = ENCHANTMENT_HANDLERS.get(choice)
+        if handler:
+            handler(game)
 
 
 def manage_shop(game):
@@ -3197,7 +3649,7 @@ def manage_shop(game):
         print("3. View all shop items")
         print("4. Back to admin menu")
 
-        choice = input("Enter choice: ").strip()
+        choice = read_input("Enter choice: ").strip()
 
         if choice == "1":
             # Add item to shop - select a master item and set its purchase price
@@ -3206,246 +3658,318 @@ def manage_shop(game):
                 continue
 
             print("\nAvailable master items:")
+            lines = []
             for i, item in enumerate(game.master_items):
                 shop_status = f"In shop: {item.purchase_price}g" if item.purchase_price is not None else "Not in shop"
-                print(f"  {i}. {item.name} ({item.item_type}) - Sells for: {item.gold_value_per_unit}g [{shop_status}]")
+                lines.append(f"  {i}. {item.name} ({item.item_type}) - Sells for: {item.gold_value_per_unit}g [{shop_status}]")
+            print("\n".join(lines))
 
             try:
-                index = int(input("\nEnter item number to add to shop: ").strip())
+                index = int(read_input("\nEnter item number to add to shop: ").strip())
                 if index < 0 or index >= len(game.master_items):
                     print("Invalid item number!")
                     continue
 
                 master_item = game.master_items[index]
 
-                purchase_price = int(input(f"Enter purchase price for {master_item.name}: ").strip())
+                purchase_price = int(read_input(f"Enter purchase price for {master_item.name}: ").strip())
                 if purchase_price < 0:
                     print("Purchase price cannot be negative!")
                     continue
 
                 master_item.purchase_price = purchase_price
+                game.invalidate_master_item_cache()
                 print(f"✓ Added {master_item.name} to shop at {purchase_price}g")
             except ValueError:
                 print("Invalid input!")
 
         elif choice == "2":
             # Remove item from shop - clear purchase price
-            shop_items = [item for item in game.master_items if item.purchase_price is not None]
+            shop_items = game.get_shop_items()
 
             if not shop_items:
                 print("Shop is empty!")
                 continue
 
             print("\nShop items:")
-            for i, item in enumerate(shop_items):
-                print(f"  {i}. {item.name} ({item.item_type}) - Buy: {item.purchase_price}g, Sells for: {item.gold_value_per_unit}g")
+            print("\n".join(f"  {i}. {item.name} ({item.item_type}) - Buy: {item.purchase_price}g, Sells for: {item.gold_value_per_unit}g"
+                             for i, item in enumerate(shop_items)))
 
             try:
-                index = int(input("\nEnter item number to remove from shop: ").strip())
+                index = int(read_input("\nEnter item number to remove from shop: ").strip())
                 if index < 0 or index >= len(shop_items):
                     print("Invalid item number!")
                     continue
 
                 item = shop_items[index]
                 item.purchase_price = None
+                game.invalidate_master_item_cache()
                 print(f"✓ Removed {item.name} from shop")
             except ValueError:
                 print("Invalid input!")
 
         elif choice == "3":
             # View all shop items
-            shop_items = [item for item in game.master_items if item.purchase_price is not None]
+            shop_items = game.get_shop_items()
 
             if not shop_items:
                 print("Shop is empty!")
                 continue
 
-            print(f"\n{'=' * 60}")
-            print("SHOP CATALOG")
-            print(f"{'=' * 60}")
-            for i, item in enumerate(shop_items):
-                print(f"{i}. {item.name} ({item.item_type}) - Buy: {item.purchase_price}g, Sells for: {item.gold_value_per_unit}g")
-            print(f"{'=' * 60}")
+            lines = ["\n" + SEP, "SHOP CATALOG", SEP]
+            lines.extend(f"{i}. {item.name} ({item.item_type}) - Buy: {item.purchase_price}g, Sells for: {item.gold_value_per_unit}g"
+                         for i, item in enumerate(shop_items))
+            lines.append(SEP)
+            print("\n".join(lines))
 
         elif choice == "4":
             break
 
 
-def admin_menu(game):
-    while True:
-        show_admin_menu()
-        choice = input("Enter choice: ").strip()
+def admin_give_gold(game):
+    """Give gold to a player."""
+    if not game.players:
+        print("No players exist!")
+        return
 
-        if choice == "1":
-            if not game.players:
-                print("No players exist!")
-                continue
+    name = get_player_name_input(game)
+    player = game.get_player(name)
+    if not player:
+        print(f"Player '{name}' not found!")
+        return
 
-            name = get_player_name_input(game)
-            player = game.get_player(name)
-            if not player:
-                print(f"Player '{name}' not found!")
-                continue
+    try:
+        amount = int(read_input(f"Amount of gold to give: ").strip())
+        if amount <= 0:
+            print("Amount must be greater than 0!")
+            return
 
-            try:
-                amount = int(input(f"Amount of gold to give: ").strip())
-                if amount <= 0:
-                    print("Amount must be greater than 0!")
-                    continue
+        player.add_gold(amount)
+        print(f"✓ Gave {amount}g to {player.name} (now has {player.gold}g)")
+    except ValueError:
+        print("Invalid amount!")
 
-                player.add_gold(amount)
-                print(f"✓ Gave {amount}g to {player.name} (now has {player.gold}g)")
-            except ValueError:
-                print("Invalid amount!")
 
-        elif choice == "2":
-            if not game.players:
-                print("No players exist!")
-                continue
+def admin_take_gold(game):
+    """Take gold from a player."""
+    if not game.players:
+        print("No players exist!")
+        return
 
-            name = get_player_name_input(game)
-            player = game.get_player(name)
-            if not player:
-                print(f"Player '{name}' not found!")
-                continue
+    name = get_player_name_input(game)
+    player = game.get_player(name)
+    if not player:
+        print(f"Player '{name}' not found!")
+        return
 
-            try:
-                amount = int(input(f"Amount of gold to take (has {player.gold}g): ").strip())
-                if amount <= 0:
-                    print("Amount must be greater than 0!")
-                    continue
+    try:
+        amount = int(read_input(f"Amount of gold to take (has {player.gold}g): ").strip())
+        if amount <= 0:
+            print("Amount must be greater than 0!")
+            return
 
-                if player.remove_gold(amount):
-                    print(f"✓ Took {amount}g from {player.name} (now has {player.gold}g)")
-                else:
-                    print(f"Player doesn't have enough gold!")
-            except ValueError:
-                print("Invalid amount!")
+        if player.remove_gold(amount):
+            print(f"✓ Took {amount}g from {player.name} (now has {player.gold}g)")
+        else:
+            print(f"Player doesn't have enough gold!")
+    except ValueError:
+        print("Invalid amount!")
 
-        elif choice == "3":
-            if not game.players:
-                print("No players exist!")
-                continue
 
-            if not game.loot_tables:
-                print("No loot tables exist!")
-                continue
+def admin_gift_item(game):
+    """Gift a copy of a loot table item to a player."""
+    if not game.players:
+        print("No players exist!")
+        return
 
-            name = get_player_name_input(game)
-            player = game.get_player(name)
-            if not player:
-                print(f"Player '{name}' not found!")
-                continue
+    if not game.loot_tables:
+        print("No loot tables exist!")
+        return
 
-            print("\nAvailable items from all tables:")
-            all_items = []
-            for table in game.loot_tables:
-                for item in table.items:
-                    all_items.append(item)
+    name = get_player_name_input(game)
+    player = game.get_player(name)
+    if not player:
+        print(f"Player '{name}' not found!")
+        return
 
-            for i, item in enumerate(all_items):
-                print(f"  {i}. {item}")
+    print("\nAvailable items from all tables:")
+    all_items = game.get_all_items()
 
-            try:
-                index = int(input("\nEnter item number to gift: ").strip())
-                if index < 0 or index >= len(all_items):
-                    print("Invalid item number!")
-                    continue
+    print("\n".join(f"  {i}. {item}" for i, item in enumerate(all_items)))
 
-                item = all_items[index]
-                item_copy = copy.deepcopy(item)
+    try:
+        index = int(read_input("\nEnter item number to gift: ").strip())
+        if index < 0 or index >= len(all_items):
+            print("Invalid item number!")
+            return
 
-                # Roll rarity for Equipment items
-                if item_copy.item_type.lower() == "equipment" and not item_copy.rarity:
-                    item_copy.rarity = game.rarity_system.roll_rarity()
-                    print(f"✨ Rolled [{item_copy.rarity}] rarity!")
+        item = all_items[index]
+        item_copy = item.clone()
 
-                player.add_item(item_copy)
-                print(f"✓ Gifted {item_copy} to {player.name}")
-            except ValueError:
-                print("Invalid input!")
+        # Roll rarity for Equipment items
+        if item_copy.item_type_lower == "equipment" and not item_copy.rarity:
+            item_copy.rarity = game.rarity_system.roll_rarity()
+            print(f"✨ Rolled [{item_copy.rarity}] rarity!")
 
-        elif choice == "4":
-            if not game.players:
-                print("No players exist!")
-                continue
+        player.add_item(item_copy)
+        print(f"✓ Gifted {item_copy} to {player.name}")
+    except ValueError:
+        print("Invalid input!")
 
-            name = get_player_name_input(game)
-            player = game.get_player(name)
-            if not player:
-                print(f"Player '{name}' not found!")
-                continue
 
-            if not player.inventory:
-                print(f"{player.name} has no items!")
-                continue
+def admin_take_item(game):
+    """Take an item from a player's inventory."""
+    if not game.players:
+        print("No players exist!")
+        return
 
-            print(f"\n{player.name}'s inventory:")
-            for i, item in enumerate(player.inventory):
-                print(f"  {i}. {item}")
+    name = get_player_name_input(game)
+    player = game.get_player(name)
+    if not player:
+        print(f"Player '{name}' not found!")
+        return
 
-            try:
-                index = int(input("\nEnter item number to take: ").strip())
-                if index < 0 or index >= len(player.inventory):
-                    print("Invalid item number!")
-                    continue
+    if not player.inventory:
+        print(f"{player.name} has no items!")
+        return
 
-                item = player.remove_item(index)
-                if item:
-                    print(f"✓ Took {item} from {player.name}")
+    print(f"\n{player.name}'s inventory:")
+    print("\n".join(f"  {i}. {item}" for i, item in enumerate(player.inventory)))
+
+    try:
+        index = int(read_input("\nEnter item number to take: ").strip())
+        if index < 0 or index >= len(player.inventory):
+            print("Invalid item number!")
+            return
+
+        item = player.remove_item(index)
+        if item:
+            print(f"✓ Took {item} from {player.name}")
+    except ValueError:
+        print("Invalid input!")
+
+
+def admin_configure_rarity_weights(game):
+    """Configure the rarity roll weights for equipment."""
+    rarity_system = game.rarity_system
+    rarities = rarity_system.rarities
+
+    lines = ["\n--- RARITY WEIGHT CONFIGURATION ---", "Current rarity weights:"]
+    total_weight = rarity_system.get_total_weight()
+    for rarity, data in rarities.items():
+        weight = data['weight']
+        max_effects = data['max_effects']
+        percentage = (weight / total_weight) * 100
+        lines.append(f"  {rarity}: weight {weight} ({percentage:.2f}%) - {max_effects} effect slots")
+    print("\n".join(lines))
+
+    print("\nEnter new weights (leave blank to keep current):")
+    weight_prompt = "{} [{}]: ".format
+    for rarity, data in rarities.items():
+        current_weight = data['weight']
+        new_weight_input = read_input(weight_prompt(rarity, current_weight)).strip()
+        if new_weight_input:
+            try:
+                new_weight = float(new_weight_input)
+                if new_weight > 0:
+                    rarity_system.set_weight(rarity, new_weight)
+                    print(f"✓ Updated {rarity} weight to {new_weight}")
+                else:
+                    print(f"Weight must be greater than 0! Keeping {current_weight}")
             except ValueError:
-                print("Invalid input!")
+                print(f"Invalid input! Keeping {current_weight}")
 
-        elif choice == "5":
-            # Configure rarity weights
-            print("\n--- RARITY WEIGHT CONFIGURATION ---")
-            print("Current rarity weights:")
-            total_weight = sum(data['weight'] for data in game.rarity_system.rarities.values())
-            for rarity, data in game.rarity_system.rarities.items():
-                weight = data['weight']
-                max_effects = data['max_effects']
-                percentage = (weight / total_weight) * 100
-                print(f"  {rarity}: weight {weight} ({percentage:.2f}%) - {max_effects} effect slots")
-
-            print("\nEnter new weights (leave blank to keep current):")
-            for rarity in game.rarity_system.rarities.keys():
-                current_weight = game.rarity_system.rarities[rarity]['weight']
-                new_weight_input = input(f"{rarity} [{current_weight}]: ").strip()
-                if new_weight_input:
-                    try:
-                        new_weight = float(new_weight_input)
-                        if new_weight > 0:
-                            game.rarity_system.set_weight(rarity, new_weight)
-                            print(f"✓ Updated {rarity} weight to {new_weight}")
-                        else:
-                            print(f"Weight must be greater than 0! Keeping {current_weight}")
-                    except ValueError:
-                        print(f"Invalid input! Keeping {current_weight}")
+    print("\n✓ Rarity weights updated!")
 
-            print("\n✓ Rarity weights updated!")
 
-        elif choice == "6":
-            # Manage shop
-            manage_shop(game)
+ADMIN_HANDLERS = {
+    "1": admin_give_gold,
+    "2": admin_take_gold,
+    "3": admin_gift_item,
+    "4": admin_take_item,
+    "5": admin_configure_rarity_weights,
+    "6": manage_shop,
+}
 
-        elif choice == "7":
-            break
 
+def admin_menu(game):
+    while True:
+        show_admin_menu()
+        choice = read_input("Enter choice: ").strip()
 
-if __name__ == "__main__":
+        if choice == "7":
+            break
+        handler = ADMIN_HANDLERS.get(choice)
+        if handler:
+            handler(game)
+
+
+MAIN_MENU_HANDLERS = {
+    "1": quick_turn_menu,
+    "2": manage_loot_table,
+    "3": manage_players,
+    "4": draw_items_menu,
+    "5": shop_menu,
+    "6": sell_items_menu,
+    "7": manage_crafting,
+    "8": manage_equipment_upgrades,
+    "9": admin_menu,
+}
+
+
+def main():
+    """Run the interactive loot table system."""
     game = GameSystem()
+    game.pretty_save = "--pretty" in sys.argv[1:]
 
+    interrupted = False
+    in_action = False  # True while a menu action may be partway through changing the game
 
-    def signal_handler(sig, frame):
-        print("\n\n⚠️  Ctrl+C detected! Auto-saving...")
+    def autosave():
+        # Only a Ctrl+C exit auto-saves; the exit menu asks first
+        if not interrupted:
+            return
         if game.save_game():
             print("✓ Game saved successfully!")
         else:
             print("❌ Failed to save game.")
         print("Exiting...")
-        sys.exit(0)
 
+    def signal_handler(sig, frame):
+        nonlocal interrupted
+        if in_action:
+            if interrupted:
+                # Second Ctrl+C: quit now rather than save a half-finished action
+                interrupted = False
+                print("\n\n⚠️  Exiting without saving...")
+                raise SystemExit(0)
+            # Let the action finish so the save never sees a half-edited game
+            interrupted = True
+            print("\n\n⚠️  Ctrl+C detected! Will auto-save and exit once this action finishes "
+                  "(Ctrl+C again to exit without saving)")
+            return
+        # Save from atexit once the interrupted code has unwound
+        print("\n\n⚠️  Ctrl+C detected! Auto-saving...")
+        interrupted = True
+        raise SystemExit(0)
 
+    def run_action(action, *args):
+        """Run a menu action, deferring a Ctrl+C exit until it has finished."""
+        nonlocal in_action, interrupted
+        in_action = True
+        try:
+            result = action(*args)
+        except BaseException:
+            # Never auto-save a game an action stopped partway through
+            interrupted = False
+            raise
+        finally:
+            in_action = False
+        if interrupted:
+            raise SystemExit(0)
+        return result
+
+    atexit.register(autosave)
     signal.signal(signal.SIGINT, signal_handler)
 
     print("Welcome to the Loot Table RPG System!")
@@ -3453,38 +3977,24 @@ if __name__ == "__main__":
 
     if os.path.exists(game.save_file):
         try:
-            load_choice = input("\nFound saved game. Load it? (y/n): ").strip().lower()
+            load_choice = read_input("\nFound saved game. Load it? (y/n): ").strip().lower()
             if load_choice == 'y':
-                if game.load_game():
+                if run_action(game.load_game):
                     print("✓ Game loaded successfully!")
                 else:
                     print("Failed to load game. Starting fresh.")
         except KeyboardInterrupt:
             signal_handler(signal.SIGINT, None)
 
+    handlers = MAIN_MENU_HANDLERS
     while True:
         show_context_header(game)
         show_main_menu()
-        choice = input("Enter your choice (1-11): ").strip()
+        choice = read_input("Enter your choice (1-11): ").strip()
 
-        if choice == "1":
-            quick_turn_menu(game)
-        elif choice == "2":
-            manage_loot_table(game)
-        elif choice == "3":
-            manage_players(game)
-        elif choice == "4":
-            draw_items_menu(game)
-        elif choice == "5":
-            shop_menu(game)
-        elif choice == "6":
-            sell_items_menu(game)
-        elif choice == "7":
-            manage_crafting(game)
-        elif choice == "8":
-            manage_equipment_upgrades(game)
-        elif choice == "9":
-            admin_menu(game)
+        handler = handlers.get(choice)
+        if handler:
+            run_action(handler, game)
         elif choice == "10":
             if game.save_game():
                 print("✓ Game saved successfully!")
@@ -3492,7 +4002,7 @@ if __name__ == "__main__":
                 print("Failed to save game.")
         elif choice == "11":
             print("\nAre you sure you want to exit?")
-            save_prompt = input("Save before exiting? (y/n/cancel): ").strip().lower()
+            save_prompt = read_input("Save before exiting? (y/n/cancel): ").strip().lower()
 
             if save_prompt == 'cancel':
                 continue
@@ -3507,3 +4017,7 @@ if __name__ == "__main__":
         else:
 
             print("Invalid choice! Please enter 0-11.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import json
 import os
+import loot_table
 from loot_table import GameSystem, Player, Consumable, LootItem
 
 def test_consumables():
@@ -72,6 +73,7 @@ def test_consumables():
     assert len(new_game.consumables) == 1
     assert new_game.consumables[0].name == "Lucky Charm"
     assert new_game.consumables[0].effect_type == "double_next_draw"
+    assert new_game.get_consumable("Lucky Charm") is new_game.consumables[0]
     print("✓ Consumables loaded correctly")
 
     # Verify player active effects loaded
@@ -94,8 +96,34 @@ def test_consumables():
     assert 'active_consumable_effects' in save_data['players']['TestPlayer']
     print("✓ Save file structure correct")
 
+    # Test 9: Saved rows follow edits made through the consumable menu
+    print("\n9. Editing a consumable and saving again...")
+    def edit_and_save(answers):
+        answers = iter(answers)
+        original_read_input = loot_table.read_input
+        loot_table.read_input = lambda prompt="": next(answers)
+        try:
+            loot_table.manage_consumables(new_game)
+        finally:
+            loot_table.read_input = original_read_input
+        new_game.save_game()
+        with open(test_save_file, 'r') as f:
+            return json.load(f)['consumables'][0]
+
+    # A bad sell value must leave the consumable, its lookup and its saved row unchanged
+    saved = edit_and_save(["2", "0", "Amulet", "abc", "5"])
+    assert new_game.get_consumable("Lucky Charm") is new_game.consumables[0]
+    assert new_game.get_consumable("Amulet") is None
+    assert saved['name'] == "Lucky Charm"
+
+    saved = edit_and_save(["2", "0", "Amulet", "75", "5"])
+    assert new_game.get_consumable("Amulet") is new_game.consumables[0]
+    assert saved['name'] == "Amulet"
+    assert saved['gold_value'] == 75
+    print("✓ Saved consumable rows follow edits")
+
     # Cleanup
-    print("\n9. Cleaning up...")
+    print("\n10. Cleaning up...")
     os.remove(test_save_file)
     print("✓ Test file removed")
 
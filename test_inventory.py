@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test player inventory bookkeeping"""
+
+from loot_table import Player, LootItem
+
+def test_item_counts():
+    print("Testing Inventory Item Counts")
+    print("=" * 60)
+
+    player = Player("TestPlayer")
+
+    # Test 1: Stacked and unique items are both counted
+    print("\n1. Adding items...")
+    player.add_item(LootItem("Gem", 0, 10, "misc", 2))
+    player.add_item(LootItem("Gem", 0, 15, "misc", 3))
+    player.add_item(LootItem("Gem", 0, 50, "equipment", 1, "Rare"))
+    assert len(player.inventory) == 2
+    assert player.get_item_count("Gem") == 6
+    assert player.get_item_count("Rock") == 0
+    print("✓ Counts track added items")
+
+    # Test 2: Consuming across stacks updates the count
+    print("\n2. Consuming items...")
+    assert not player.consume_item_by_name("Gem", 7)
+    assert player.consume_item_by_name("Gem", 4)
+    assert player.get_item_count("Gem") == 2
+    assert player.consume_item_by_name("Gem", 1)
+    assert len(player.inventory) == 1
+    assert player.inventory[0].rarity == "Rare"
+    print("✓ Counts track consumed items")
+
+    # Test 3: Removing a stack updates the count
+    print("\n3. Removing items...")
+    while player.inventory:
+        player.remove_item(0)
+    assert player.get_item_count("Gem") == 0
+    assert not player.consume_item_by_name("Gem", 1)
+    print("✓ Counts track removed items")
+
+    # Test 4: A stack enchanted in place stops accepting plain copies
+    print("\n4. Stacking after enchanting...")
+    player.add_item(LootItem("Sword", 0, 10, "equipment", 1))
+    player.inventory[0].enchantments.append(("Sharp", 5))
+    player.unindex_stack(player.inventory[0])
+    player.add_item(LootItem("Sword", 0, 10, "equipment", 1))
+    player.add_item(LootItem("Sword", 0, 10, "equipment", 2))
+    assert len(player.inventory) == 2
+    assert player.inventory[1].quantity == 3
+    assert player.get_item_count("Sword") == 4
+    print("✓ Plain copies stack separately from the enchanted one")
+
+    # Test 5: The consumable listing follows inventory changes
+    print("\n5. Listing consumables...")
+    player.add_item(LootItem("Potion", 0, 5, "consumable", 1))
+    assert player.get_consumable_items() == [(2, player.inventory[2])]
+    player.remove_item(0)
+    assert player.get_consumable_items() == [(1, player.inventory[1])]
+    player.consume_item_by_name("Potion", 1)
+    assert player.get_consumable_items() == []
+    print("✓ Consumable indexes track inventory changes")
+
+    print("\n" + "=" * 60)
+    print("ALL TESTS PASSED! ✓")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_item_counts()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Test master item editing"""
+
+import loot_table
+from loot_table import GameSystem
+
+def run_menu(game, answers):
+    """Drive manage_master_items with scripted answers."""
+    answers = iter(answers)
+    original_read_input = loot_table.read_input
+    loot_table.read_input = lambda prompt="": next(answers)
+    try:
+        loot_table.manage_master_items(game)
+    finally:
+        loot_table.read_input = original_read_input
+
+def test_master_item_edit():
+    print("Testing Master Item Editing")
+    print("=" * 60)
+
+    game = GameSystem()
+    game.add_master_item("Iron", "misc", 5, 20)
+    assert game.get_shop_items() == [game.master_items[0]]
+    item = game.master_items[0]
+
+    # Test 1: A bad purchase price after a type change leaves the item untouched
+    print("\n1. Editing with a bad purchase price...")
+    run_menu(game, ["2", "0", "", "Equipment", "7", "abc", "5"])
+    assert item.item_type == "misc"
+    assert item.item_type_lower == "misc"
+    assert item.gold_value_per_unit == 5
+    assert item.purchase_price == 20
+    assert game.get_shop_items() == [item]
+    print("✓ Failed edit changed nothing")
+
+    # Test 2: A valid edit updates the type copies and the cached views
+    print("\n2. Editing with valid values...")
+    run_menu(game, ["2", "0", "", "Equipment", "7", "none", "5"])
+    assert item.item_type == "Equipment"
+    assert item.item_type_lower == "equipment"
+    assert item.gold_value_per_unit == 7
+    assert item.purchase_price is None
+    assert game.get_shop_items() == []
+    print("✓ Valid edit refreshed the cached views")
+
+    print("\n" + "=" * 60)
+    print("ALL TESTS PASSED! ✓")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_master_item_edit()